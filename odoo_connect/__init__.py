@@ -1,8 +1,17 @@
 import logging
 import urllib.parse
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
-from .odoo_rpc import OdooClient, OdooModel, OdooServerError  # noqa
+from .metadata import METADATA_REGISTRY, DiskMetadataCache, MetadataRegistry  # noqa
+from .odoo_rpc import (  # noqa
+    JsonCodec,
+    OdooClient,
+    OdooModel,
+    OdooServerError,
+    Transport,
+    get_codec,
+)
+from .odoo_rpc_async import HTTP_ERRORS, AsyncOdooClient, AsyncOdooModel  # noqa
 
 __doc__ = """Simple Odoo RPC library."""
 
@@ -13,6 +22,56 @@ class OdooConnectionError(OdooServerError):
     pass
 
 
+def _parse_url(
+    url: str,
+    database: Optional[str],
+    username: Optional[str],
+    password: Optional[str],
+    *,
+    infer_parameters: bool,
+) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+    """Parse the url and infer connection parameters (see `connect`)
+
+    :return: A tuple (url, database, username, password)
+    """
+    urlx = urllib.parse.urlparse(url)
+    if infer_parameters:
+        if not urlx.scheme and not urlx.netloc and urlx.path:
+            # we just have a server name in the path (reparse with slashes)
+            urlx = urllib.parse.urlparse('//' + urlx.path.lstrip('/'))
+        if not urlx.hostname:
+            raise ValueError(f"No hostname in url {url}")
+        if not database and len(urlx.path) > 1:
+            # extract the database from the path if it's there
+            path = urlx.path.lstrip('/')
+            if '/' not in path:
+                database = path
+                urlx = urlx._replace(path='/')
+        if not database:
+            # try to extract the database from the hostname
+            # dbname.runbot*.odoo.com or dbname.dev.odoo.com
+            # except IP addresses
+            name_split = (urlx.hostname or '').split('.')
+            if len(name_split) > 3 and not name_split[-1].isnumeric():
+                database = name_split[0]
+        if not username and urlx.username:
+            # read username and password from the url
+            username = urlx.username
+            password = urlx.password
+        if not password and username:
+            # copy username to password when not set
+            password = username
+        # make sure the url does not contain credentials anymore
+        at_loc = urlx.netloc.find('@')
+        if at_loc > 0:
+            urlx = urlx._replace(netloc=urlx.netloc[at_loc + 1 :])
+    if not urlx.scheme:
+        # add a scheme
+        urlx = urlx._replace(scheme="http" if urlx.hostname == "localhost" else "https")
+    url = urlx.geturl()
+    return url, database, username, password
+
+
 def connect(
     url: str,
     database: Optional[str] = None,
@@ -22,6 +81,9 @@ def connect(
     check_connection: bool = True,
     context: Optional[Dict] = None,
     monodb: bool = False,
+    transport: Optional[Transport] = None,
+    codec: Optional[JsonCodec] = None,
+    metadata_cache: Optional[DiskMetadataCache] = None,
     **kw,
 ) -> OdooClient:
     """Connect to an odoo database.
@@ -46,6 +108,9 @@ def connect(
     :param check_connection: Try to connect (default: True)
     :param monodb: Allow for a db.monodb call to find the default database
            (default: set when database == "@monodb")
+    :param transport: The HTTP transport settings (default: Transport())
+    :param codec: The JSON codec (default: fastest installed, see `get_codec`)
+    :param metadata_cache: Persistent cache for the fields of models (default: none)
     :return: Connection object to the Odoo instance
     """
     if kw:
@@ -53,45 +118,19 @@ def connect(
     if database == '@monodb':
         monodb = True
         database = None
-    urlx = urllib.parse.urlparse(url)
-    if infer_parameters:
-        if not urlx.scheme and not urlx.netloc and urlx.path:
-            # we just have a server name in the path (reparse with slashes)
-            urlx = urllib.parse.urlparse('//' + urlx.path.lstrip('/'))
-        if not urlx.hostname:
-            raise ValueError(f"No hostname in url {url}")
-        if not database and len(urlx.path) > 1:
-            # extract the database from the path if it's there
-            path = urlx.path.lstrip('/')
-            if '/' not in path:
-                database = path
-                urlx = urlx._replace(path='/')
-        if not database:
-            # try to extract the database from the hostname
-            # dbname.runbot*.odoo.com or dbname.dev.odoo.com
-            # except IP addresses
-            name_split = (urlx.hostname or '').split('.')
-            if len(name_split) > 3 and not name_split[-1].isnumeric():
-                database = name_split[0]
-        if not username and urlx.username:
-            # read username and password from the url
-            username = urlx.username
-            password = urlx.password
-        if not password and username:
-            # copy username to password when not set
-            password = username
-        # make sure the url does not contain credentials anymore
-        at_loc = urlx.netloc.find('@')
-        if at_loc > 0:
-            urlx = urlx._replace(netloc=urlx.netloc[at_loc + 1 :])
-    if not urlx.scheme:
-        # add a scheme
-        urlx = urlx._replace(scheme="http" if urlx.hostname == "localhost" else "https")
-    url = urlx.geturl()
+    url, database, username, password = _parse_url(
+        url, database, username, password, infer_parameters=infer_parameters
+    )
 
     # Create the connection
     try:
-        client = OdooClient(url=url, database=database or 'odoo')
+        client = OdooClient(
+            url=url,
+            database=database or 'odoo',
+            transport=transport,
+            codec=codec,
+            metadata_cache=metadata_cache,
+        )
         if not database:
             database = client._find_default_database(monodb=monodb)
             check_connection = database == 'odoo'  # check if it's the default database
@@ -108,10 +147,73 @@ def connect(
     except (ConnectionError, IOError, OdooServerError) as e:
         raise OdooConnectionError(e)
 
+
+async def connect_async(
+    url: str,
+    database: Optional[str] = None,
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    infer_parameters: bool = True,
+    check_connection: bool = True,
+    context: Optional[Dict] = None,
+    monodb: bool = False,
+    transport: Optional[Transport] = None,
+    codec: Optional[JsonCodec] = None,
+    **kw,
+) -> AsyncOdooClient:
+    """Connect to an odoo database using an asynchronous client.
+
+    The parameters are the same as for `connect`.
+
+    :return: Asynchronous connection object to the Odoo instance
+    """
+    if kw:
+        logging.warning('Unknown connect_async() paramters: %s', list(kw.keys()))
+    if database == '@monodb':
+        monodb = True
+        database = None
+    url, database, username, password = _parse_url(
+        url, database, username, password, infer_parameters=infer_parameters
+    )
+
+    # Create the connection
+    client = AsyncOdooClient(url=url, database=database or 'odoo', transport=transport, codec=codec)
+    try:
+        if not database:
+            database = await client._find_default_database(monodb=monodb)
+            check_connection = database == 'odoo'  # check if it's the default database
+            client.database = database
+        if context:
+            client.context.update(context)
+        if username:
+            await client.authenticate(username, password or '')
+        elif check_connection:
+            await client.version()
+        return client
+    except (NotImplementedError, OdooConnectionError):
+        await client.close()
+        raise
+    except (ConnectionError, IOError, OdooServerError) + HTTP_ERRORS as e:
+        await client.close()
+        raise OdooConnectionError(e)
+    except BaseException:
+        await client.close()
+        raise
+
+
 __all__ = [
     "connect",
+    "connect_async",
     "OdooConnectionError",
     "OdooClient",
     "OdooModel",
-    "OdooServerError",    
+    "AsyncOdooClient",
+    "AsyncOdooModel",
+    "OdooServerError",
+    "Transport",
+    "JsonCodec",
+    "get_codec",
+    "DiskMetadataCache",
+    "MetadataRegistry",
+    "METADATA_REGISTRY",
 ]
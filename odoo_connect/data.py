@@ -1,9 +1,31 @@
+import csv
+import gzip
+import hashlib
+import io
+import itertools
 import json
 import logging
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast, overload
-
-from .format import Formatter, decode_binary
-from .odoo_rpc import OdooClient, OdooModel, urljoin
+import os
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+    overload,
+)
+
+from .format import Formatter, decode_binary, decode_datetime, format_datetime
+from .odoo_rpc import OdooClient, OdooModel, OdooServerError, parallel_map, urljoin
 
 __doc__ = """Export and import data from Odoo.
 
@@ -151,22 +173,123 @@ def list_attachments(
     return data
 
 
-def _download_content(
-    odoo: OdooClient, url: str, *, params: Dict = {}, access_token: Optional[str] = None
-) -> bytes:
-    """Download contents from a URL"""
+def _content_request(
+    odoo: OdooClient,
+    url: str,
+    *,
+    params: Dict = {},
+    access_token: Optional[str] = None,
+    stream: bool = False,
+):
+    """Send a GET request for contents and return the response"""
     # In the implementation, the session is authenticated.
     session = getattr(odoo, 'session', None)
     if not session:
         raise RuntimeError('Odoo client must have a session to download contents')
 
     url = urljoin(odoo.url, url)
-    params = {}
     if access_token:
         params = {**params, 'access_token': access_token}
-    req = session.get(url, params=params)
+    req = session.get(url, params=params, timeout=odoo.transport.timeout, stream=stream)
     req.raise_for_status()
-    return req.content
+    return req
+
+
+def _download_content(
+    odoo: OdooClient, url: str, *, params: Dict = {}, access_token: Optional[str] = None
+) -> bytes:
+    """Download contents from a URL"""
+    return _content_request(odoo, url, params=params, access_token=access_token).content
+
+
+def _download_to_file(
+    odoo: OdooClient, url: str, path: Path, *, params: Dict = {}, chunk_size: int = 65536
+) -> str:
+    """Download contents from a URL into a file by chunks
+
+    The contents are written to a temporary file which replaces the path
+    once the download is complete.
+
+    :return: The SHA-1 hex digest of the contents
+    """
+    digest = hashlib.sha1()
+    part_path = path.with_name(path.name + '.part')
+    with _content_request(odoo, url, params=params, stream=True) as req:
+        with open(part_path, 'wb') as f:
+            for chunk in req.iter_content(chunk_size):
+                digest.update(chunk)
+                f.write(chunk)
+    os.replace(part_path, path)
+    return digest.hexdigest()
+
+
+def _file_checksum(path: Path, chunk_size: int = 65536) -> Optional[str]:
+    """SHA-1 hex digest of a file (None if the file does not exist)"""
+    digest = hashlib.sha1()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def _attachment_file_name(attachment: Dict) -> str:
+    """Name of the file for an attachment: <id>_<name>"""
+    name = os.path.basename(str(attachment.get('name') or '').replace('\\', '/'))
+    name = ''.join(c if c.isprintable() else '_' for c in name).strip(' .')
+    return f"{attachment['id']}_{name}" if name else str(attachment['id'])
+
+
+def download_attachments(
+    odoo: OdooClient,
+    ids: List[int],
+    directory: Union[str, Path],
+    *,
+    workers: int = 4,
+    chunk_size: int = 65536,
+) -> Dict[int, Path]:
+    """Download attachments into a directory
+
+    Contrary to `get_attachments`, the contents are not loaded in memory,
+    each attachment is streamed from /web/content into a file named
+    "<id>_<name>". Existing files whose SHA-1 matches the checksum of the
+    attachment are not downloaded again, so an interrupted download
+    can be resumed by calling the function again.
+    Attachments which are URLs are skipped.
+
+    :param odoo: Odoo client
+    :param ids: List of ids of attachments
+    :param directory: The target directory (created if needed)
+    :param workers: Number of concurrent downloads (default: 4)
+    :param chunk_size: Size of the chunks written to the files
+    :return: Dict id -> path of the file
+    """
+    log = logging.getLogger(__name__)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    attachments = odoo['ir.attachment']._read(ids, ['name', 'checksum', 'type'])
+    attachments = [a for a in attachments if a.get('type') != 'url']
+
+    def download(attachment: Dict) -> Tuple[int, Path]:
+        path = directory / _attachment_file_name(attachment)
+        checksum = attachment.get('checksum')
+        if checksum and _file_checksum(path, chunk_size) == checksum:
+            log.debug('Attachment %d already downloaded', attachment['id'])
+            return attachment['id'], path
+        url = 'web/content/%d' % attachment['id']
+        digest = _download_to_file(
+            odoo, url, path, params={'download': 'true'}, chunk_size=chunk_size
+        )
+        if checksum and digest != checksum:
+            path.unlink()
+            raise ValueError(f"Checksum mismatch for attachment {attachment['id']}")
+        return attachment['id'], path
+
+    result = dict(parallel_map(download, attachments, workers))
+    log.info('Downloaded %d attachments into %s', len(result), directory)
+    return result
 
 
 def download_content(
@@ -274,6 +397,10 @@ def load_data(
     method_row_type=None,
     fields: Optional[List[str]] = None,
     formatter: Optional[Formatter] = None,
+    batch_size: int = 0,
+    group_by: str = '',
+    workers: int = 1,
+    resilient: bool = False,
 ):
     """Load the data into the model.
 
@@ -283,19 +410,41 @@ def load_data(
 
     The default method used is `load` where field name's "." are replaced with
     "/" to make it work.
-    `write` is handled specially, by making write() and create() calls.
+    `write` is handled specially, by making write() and create() calls;
+    rows with the same values are updated by a single write() call.
     You can use `create` to insert new records.
     Otherwise, the model can have a custom method you could use.
 
+    When a batch size is given, the data is split into batches (see `make_batches`)
+    which are loaded by separate calls, possibly in parallel. Each call is a
+    separate transaction on the server. The results are merged:
+    for `load`, the ids of the batches and the messages (with row numbers
+    of the input data, the `record` is replaced by the number of its first row,
+    records being consecutive rows with the same `group_by` value); for methods returning a value per row,
+    the values in the input order; otherwise, the list of results per batch.
+
+    In resilient mode (only for `load`), when a call fails, the failing rows
+    are isolated and the other rows are loaded. The rows reported in the error
+    messages are removed and the remaining ones are loaded again in a single call;
+    when no row is reported, the rows are split in two until the failing ones
+    are found (consecutive rows with the same `group_by` value are kept together).
+    The result contains the `errors` as a list of `{'row': index, 'messages': [...]}`.
+
     :param model: The model
     :param data: The list of rows (dict or list)
     :param method: The name of the method to call
     :param method_row_type: The type of the rows; dict (default) or list
     :param fields: List of field name for list rows
     :param formatter: The formatter to use
+    :param batch_size: Maximum number of rows per call (default: 0, no batching)
+    :param group_by: Field to group by when batching (see `make_batches`)
+    :param workers: Number of calls executed in parallel (default: 1)
+    :param resilient: Isolate the failing rows and load the other ones
     :return: The result of the method call
     """
     log = logging.getLogger(__name__)
+    if resilient and method != 'load':
+        raise ValueError('Resilient mode is supported only by the load method')
 
     if method == 'load':
         method_row_type = list
@@ -316,17 +465,215 @@ def load_data(
     else:
         raise Exception('Unsupported method row type: %s' % method_row_type)
 
-    log.info("Load data using %s.%s(), %d records", model.model, method, len(data))
+    if not group_by:
+        groups = list(range(len(data)))
+    elif method_row_type == list:
+        group_index = cast(List[str], fields).index(group_by)
+        groups = [row[group_index] for row in data]
+    else:
+        groups = [row[group_by] for row in data]
+
+    if not batch_size or len(data) <= batch_size:
+        log.info("Load data using %s.%s(), %d records", model.model, method, len(data))
+        if resilient:
+            return __load_data_resilient(model, data, groups, cast(List[str], fields))
+        return __load_data_call(model, method, data, fields, workers=workers)
+
+    # keep the index of the rows to return results in the input order
+    batches = [
+        [b['index'] for b in batch]
+        for batch in make_batches(
+            ({'index': i, 'group': group} for i, group in enumerate(groups)),
+            batch_size=batch_size,
+            group_by='group' if group_by else '',
+        )
+    ]
+    log.info(
+        "Load data using %s.%s(), %d records in %d batches",
+        model.model,
+        method,
+        len(data),
+        len(batches),
+    )
+
+    def load_batch(batch: List[int]):
+        batch_data = [data[i] for i in batch]
+        batch_groups = [groups[i] for i in batch]
+        if resilient:
+            return __load_data_resilient(model, batch_data, batch_groups, cast(List[str], fields))
+        result = __load_data_call(model, method, batch_data, fields)
+        if method == 'load':
+            # map the records of the messages to their first row
+            record_rows = _record_rows(list(range(len(batch))), batch_groups)
+            for message in result.get('messages') or []:
+                record = message.get('record')
+                if isinstance(record, int) and record < len(record_rows):
+                    message['record'] = record_rows[record]
+        return result
+
+    results = parallel_map(load_batch, batches, max_workers=workers)
+    return __merge_load_results(method, batches, results)
+
+
+def __load_data_call(
+    model: OdooModel, method: str, data: List, fields: Optional[List[str]], *, workers: int = 1
+):
+    """Call the load method for formatted data"""
     if method == 'load':
         fields = [f.replace('.', '/') for f in cast(List[str], fields)]
         return model.execute(method, fields=fields, data=data)
     if method == 'write':
-        return __load_data_write(model, data)
+        return __load_data_write(model, data, workers=workers)
     if fields:
         return model.execute(method, data, fields=fields)
     return model.execute(method, data)
 
 
+def _record_rows(rows: List[int], groups: List) -> List[int]:
+    """The first row of each record, consecutive rows of a group form a record
+
+    :param rows: The rows (positions in groups)
+    :param groups: The group of each row
+    :return: The first row of each record, indexed as the records of load()
+    """
+    return [r for i, r in enumerate(rows) if not i or groups[r] != groups[rows[i - 1]]]
+
+
+def __load_data_resilient(model: OdooModel, data: List, groups: List, fields: List[str]) -> Dict:
+    """Call load() and isolate the failing rows (see `load_data`)
+
+    :param data: The formatted rows
+    :param groups: The group of each row, consecutive rows of a group are not split
+    :return: {'ids': [...], 'messages': [...], 'errors': [{'row': x, 'messages': [...]}]}
+    """
+    log = logging.getLogger(__name__)
+    load_fields = [f.replace('.', '/') for f in fields]
+    ids: List[int] = []
+    messages: List[Dict] = []
+    errors: Dict[int, List[Dict]] = {}
+    pending: List[List[int]] = [list(range(len(data)))]
+    while pending:
+        positions = pending.pop(0)
+        try:
+            result = model.execute('load', fields=load_fields, data=[data[p] for p in positions])
+        except OdooServerError as e:
+            result = {'ids': False, 'messages': [{'type': 'error', 'message': str(e)}]}
+        # map the rows and records of the messages to the positions in data
+        record_positions = _record_rows(positions, groups)
+        batch_messages = []
+        message_rows = []
+        for message in result.get('messages') or []:
+            rows = message.get('rows')
+            if isinstance(rows, dict):
+                row_positions = [positions[r] for r in range(rows['from'], rows['to'] + 1)]
+                message = {**message, 'rows': {'from': row_positions[0], 'to': row_positions[-1]}}
+            else:
+                row_positions = []
+            record = message.get('record')
+            if isinstance(record, int) and record < len(record_positions):
+                # the position of the first row of the record
+                message = {**message, 'record': record_positions[record]}
+            batch_messages.append(message)
+            message_rows.append(row_positions)
+        if isinstance(result.get('ids'), list):
+            ids.extend(result['ids'])
+            messages.extend(batch_messages)
+            continue
+
+        # find the failing groups from the error messages
+        failed_groups = {
+            groups[p]
+            for message, rows in zip(batch_messages, message_rows)
+            if message.get('type') == 'error'
+            for p in rows
+        }
+        failed = [p for p in positions if groups[p] in failed_groups]
+        if failed:
+            log.debug('Load: %d rows failed out of %d', len(failed), len(positions))
+            for p in failed:
+                errors[p] = [
+                    message
+                    for message, rows in zip(batch_messages, message_rows)
+                    if any(groups[r] == groups[p] for r in rows)
+                ]
+            failed_set = set(failed)
+            remaining = [p for p in positions if p not in failed_set]
+            if remaining:
+                pending.insert(0, remaining)
+            continue
+        # split in two parts, at the group boundary closest to the middle
+        boundaries = [
+            i for i in range(1, len(positions)) if groups[positions[i]] != groups[positions[i - 1]]
+        ]
+        if boundaries:
+            middle = min(boundaries, key=lambda i: abs(2 * i - len(positions)))
+            log.debug('Load: split %d rows at %d', len(positions), middle)
+            pending[0:0] = [positions[:middle], positions[middle:]]
+            continue
+        for p in positions:
+            errors[p] = batch_messages
+    return {
+        'ids': ids,
+        'messages': messages,
+        'errors': [{'row': p, 'messages': errors[p]} for p in sorted(errors)],
+    }
+
+
+def __merge_load_results(method: str, batch_indexes: List[List[int]], results: List):
+    """Merge the results of batches loaded by `load_data`
+
+    :param method: The load method
+    :param batch_indexes: The indexes of the rows in the input data for each batch
+    :param results: The results of each batch
+    """
+    row_count = sum(len(indexes) for indexes in batch_indexes)
+    if method == 'load':
+        # records may span multiple rows, so ids are ordered by batch
+        ids: List[int] = []
+        messages: List[Dict] = []
+        errors: List[Dict] = []
+
+        def map_message(message: Dict, indexes: List[int]) -> Dict:
+            message = dict(message)
+            if isinstance(message.get('rows'), dict):
+                message['rows'] = {k: indexes[v] for k, v in message['rows'].items()}
+            if isinstance(message.get('record'), int):
+                message['record'] = indexes[message['record']]
+            return message
+
+        for indexes, result in sorted(zip(batch_indexes, results), key=lambda r: r[0][0]):
+            ids.extend(result.get('ids') or [])
+            messages.extend(map_message(m, indexes) for m in result.get('messages') or [])
+            for error in result.get('errors') or []:
+                error_messages = [map_message(m, indexes) for m in error['messages']]
+                errors.append({'row': indexes[error['row']], 'messages': error_messages})
+        if any('errors' in result for result in results):
+            errors.sort(key=lambda e: e['row'])
+            return {'ids': ids, 'messages': messages, 'errors': errors}
+        return {'ids': ids, 'messages': messages}
+
+    def per_row(values_list: List[List]) -> List:
+        merged = [None] * row_count
+        for indexes, values in zip(batch_indexes, values_list):
+            for i, value in zip(indexes, values):
+                merged[i] = value
+        return merged
+
+    if method == 'write':
+        return {
+            'write_count': sum(r['write_count'] for r in results),
+            'create_count': sum(r['create_count'] for r in results),
+            'ids': per_row([r['ids'] for r in results]),
+            'write_groups': [g for r in results for g in r['write_groups']],
+        }
+    if all(
+        isinstance(result, list) and len(result) == len(indexes)
+        for indexes, result in zip(batch_indexes, results)
+    ):
+        return per_row(results)
+    return results
+
+
 def __convert_to_type_list(
     data: Iterable, fields: Optional[List[str]]
 ) -> Tuple[Iterable[List], List[str]]:
@@ -366,21 +713,38 @@ def __convert_to_type_dict(data: Iterable, fields: Optional[List[str]]) -> Itera
     return data
 
 
-def __load_data_write(model: OdooModel, data: List[Dict]) -> Dict:
+def __load_data_write(model: OdooModel, data: List[Dict], *, workers: int = 1) -> Dict:
     """Use multiple write() and create() calls to update data
 
-    :return: {'write_count': x, 'create_count': x, 'ids': [list of ids]}
+    The values of rows with the same id are merged first (the last row wins),
+    then records having the same values are grouped in a single write() call.
+
+    :return: {'write_count': x, 'create_count': x, 'ids': [list of ids],
+             'write_groups': [{'ids': [...], 'fields': [...], 'time': seconds}]}
     """
     create_data = []
     ids = []
+    write_data: Dict[int, Dict] = {}
     for d in data:
         id = d.pop('id')
         if id:
-            model.execute('write', id, d)
+            write_data.setdefault(id, {}).update(d)
             ids.append(id)
         else:
             create_data.append(d)
             ids.append(0)
+    groups: Dict[str, Tuple[Dict, List[int]]] = {}
+    for id, values in write_data.items():
+        key = repr(sorted(values.items()))
+        groups.setdefault(key, (values, []))[1].append(id)
+
+    def write_group(group: Tuple[Dict, List[int]]) -> Dict:
+        values, write_ids = group
+        start = time.perf_counter()
+        model.execute('write', write_ids, values)
+        return {'ids': write_ids, 'fields': list(values), 'time': time.perf_counter() - start}
+
+    write_groups = parallel_map(write_group, list(groups.values()), max_workers=workers)
     if create_data:
         created_ids = model.execute('create', create_data)
         iids = iter(created_ids)
@@ -392,25 +756,18 @@ def __load_data_write(model: OdooModel, data: List[Dict]) -> Dict:
         'write_count': len(data) - len(create_data),
         'create_count': len(create_data),
         'ids': ids,
+        'write_groups': write_groups,
     }
 
 
-def export_data(
+def _export_parameters(
     model: OdooModel,
     filter_or_domain: Union[str, List],
     export_or_fields: Union[str, List[str]],
-    with_header: bool = True,
-    expand_many: bool = False,
-) -> List[List]:
-    """Export data into a tabular format
+) -> Tuple[List, List[str]]:
+    """Get the domain and the fields to export (see `export_data`)
 
-    :param model: Odoo model
-    :param filter_or_domain: Either a domain or an ir.filer name
-    :param export_or_fields: Either a list of fields (like is search_read_dict)
-        or an ir.exports name
-    :param with_header: Include the header in the result (default: True)
-    :param expand_many: Flatten lists embedded in the result (default: False)
-    :return: List of rows with data
+    :return: A tuple (domain, fields)
     """
     log = logging.getLogger(__name__)
     odoo = model.odoo
@@ -450,17 +807,577 @@ def export_data(
         fields = export_or_fields
     if not fields:
         raise ValueError('No fields to export')
+    return domain, fields
+
+
+def export_data(
+    model: OdooModel,
+    filter_or_domain: Union[str, List],
+    export_or_fields: Union[str, List[str]],
+    with_header: bool = True,
+    expand_many: bool = False,
+    shard_size: int = 0,
+    workers: int = 1,
+) -> List[List]:
+    """Export data into a tabular format
+
+    When shard_size is set, the ids of the records are searched first
+    and then shards of records are read concurrently.
+    Each shard is read sequentially by its worker, so there are at most
+    `workers` concurrent requests; keep it below the `pool_maxsize`
+    of the transport to reuse the connections.
+
+    :param model: Odoo model
+    :param filter_or_domain: Either a domain or an ir.filer name
+    :param export_or_fields: Either a list of fields (like is search_read_dict)
+        or an ir.exports name
+    :param with_header: Include the header in the result (default: True)
+    :param expand_many: Flatten lists embedded in the result (default: False)
+    :param shard_size: Number of records read by each call (default: read all at once)
+    :param workers: Number of shards read concurrently (default: 1)
+    :return: List of rows with data
+    """
+    log = logging.getLogger(__name__)
+    domain, fields = _export_parameters(model, filter_or_domain, export_or_fields)
 
     log.info('Export: execute search on %s', model.model)
-    records = model.search_read_dict(domain, fields)
+    if shard_size:
+        ids = model.search(domain)
+        shards = [ids[i : i + shard_size] for i in range(0, len(ids), shard_size)]
+        log.info('Export: read %d records in %d shards', len(ids), len(shards))
 
-    log.info('Export: done, cleaning data')
-    data = list(flatten(records, fields, expand_many=expand_many))
+        def read_shard(shard_ids: List[int]) -> List[List]:
+            records = model.read_dict(shard_ids, fields)
+            return list(flatten(records, fields, expand_many=expand_many))
+
+        data = [row for rows in parallel_map(read_shard, shards, workers) for row in rows]
+    else:
+        # records are streamed and flattened as they are received
+        records = model.search_read_dict_iter(domain, fields)
+        data = list(flatten(records, fields, expand_many=expand_many))
+    log.info('Export: done, %d rows', len(data))
     if with_header:
         data.insert(0, [str(f) for f in fields])
     return data
 
 
+def export_to_file(
+    model: OdooModel,
+    filter_or_domain: Union[str, List],
+    export_or_fields: Union[str, List[str]],
+    path: Union[str, Path],
+    format: str = 'csv',
+    *,
+    with_header: bool = True,
+    expand_many: bool = False,
+    page_size: int = 1000,
+    compress: Optional[bool] = None,
+) -> int:
+    """Export data into a file
+
+    The records are read by pages and written as they are received,
+    so the memory used does not depend on the number of records.
+
+    For csv files, lists and dicts are written in JSON.
+    For jsonl files, each line is a JSON object with the exported fields.
+
+    :param model: Odoo model
+    :param filter_or_domain: Either a domain or an ir.filer name
+    :param export_or_fields: Either a list of fields or an ir.exports name (see `export_data`)
+    :param path: The path of the file
+    :param format: The format of the file: csv (default) or jsonl
+    :param with_header: Write the header in csv files (default: True)
+    :param expand_many: Flatten lists embedded in the result (default: False)
+    :param page_size: Number of records read by each call (default: 1000)
+    :param compress: Compress with gzip (default: when path ends with .gz)
+    :return: The number of rows written
+    """
+    log = logging.getLogger(__name__)
+    if format not in ('csv', 'jsonl'):
+        raise ValueError('Unsupported export format: %s' % format)
+    domain, fields = _export_parameters(model, filter_or_domain, export_or_fields)
+    path = Path(path)
+    if compress is None:
+        compress = path.suffix == '.gz'
+
+    log.info('Export: write %s to %s', model.model, path)
+    records = model.search_read_dict_iter(domain, fields, page_size=page_size)
+    rows = flatten(records, fields, expand_many=expand_many)
+    names = [str(f) for f in fields]
+    with cast(IO[bytes], gzip.open(path, 'wb') if compress else open(path, 'wb')) as file:
+        count = _write_rows(file, rows, names, format, model.odoo.codec, header=with_header)
+    log.info('Export: done, %d rows', count)
+    return count
+
+
+def _write_rows(
+    file: IO[bytes], rows: Iterable[List], names: List[str], format: str, codec, *, header: bool
+) -> int:
+    """Write rows in csv or jsonl format (see `export_to_file`)
+
+    :return: The number of rows written
+    """
+    count = 0
+    if format == 'csv':
+        text_file = io.TextIOWrapper(file, encoding='utf-8', newline='')
+        writer = csv.writer(text_file)
+        if header:
+            writer.writerow(names)
+        for row in rows:
+            writer.writerow([json.dumps(v) if isinstance(v, (list, dict)) else v for v in row])
+            count += 1
+        text_file.flush()
+        text_file.detach()
+    else:
+        for row in rows:
+            file.write(codec.dumps(dict(zip(names, row))) + b'\n')
+            count += 1
+    return count
+
+
+def _arrow_type(model: OdooModel, field_name: str):
+    """Get the Arrow type of a field path (using the field types)"""
+    import pyarrow as pa
+
+    parts = field_name.split('.')
+    is_list = False
+    for i, part in enumerate(parts):
+        info = model.fields().get(part)
+        if info is None:
+            raise ValueError(f'Invalid field {field_name} in {model.model}')
+        field_type = info.get('type') or ''
+        if i + 1 < len(parts):
+            if not info.get('relation'):
+                raise ValueError(f'{part} is not a relation in {model.model}')
+            is_list = is_list or '2many' in field_type
+            model = model.odoo.get_model(info['relation'])
+    if part == 'id' or field_type in ('integer', 'many2one', 'many2one_reference'):
+        value_type = pa.int64()
+    elif field_type in ('one2many', 'many2many'):
+        value_type = pa.list_(pa.int64())
+    elif field_type in ('float', 'monetary'):
+        value_type = pa.float64()
+    elif field_type == 'boolean':
+        value_type = pa.bool_()
+    elif field_type == 'date':
+        value_type = pa.date32()
+    elif field_type == 'datetime':
+        value_type = pa.timestamp('s')
+    elif field_type == 'selection':
+        value_type = pa.dictionary(pa.int32(), pa.string())
+    else:
+        value_type = pa.string()
+    return pa.list_(value_type) if is_list else value_type
+
+
+def _arrow_array(values: List, value_type):
+    """Build an Arrow array from Odoo values (False is null except for booleans)"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if value_type != pa.bool_():
+        values = [None if v is False else v for v in values]
+    if pa.types.is_list(value_type):
+        # convert the values of the lists with the type of the elements
+        offsets = [0]
+        children: List = []
+        for v in values:
+            if v is not None:
+                children.extend(v if isinstance(v, list) else [v])
+            offsets.append(len(children))
+        return pa.ListArray.from_arrays(
+            pa.array(offsets, pa.int32()),
+            _arrow_array(children, value_type.value_type),
+            type=value_type,
+            mask=pa.array([v is None for v in values], pa.bool_()),
+        )
+    if pa.types.is_date(value_type):
+        dates = pc.strptime(pa.array(values, pa.string()), format='%Y-%m-%d', unit='s')
+        return dates.cast(value_type)
+    if pa.types.is_timestamp(value_type):
+        return pc.strptime(pa.array(values, pa.string()), format='%Y-%m-%d %H:%M:%S', unit='s')
+    if pa.types.is_dictionary(value_type):
+        return pa.array(values, pa.string()).dictionary_encode()
+    return pa.array(values, value_type)
+
+
+def export_arrow_batches(
+    model: OdooModel,
+    filter_or_domain: Union[str, List],
+    export_or_fields: Union[str, List[str]],
+    *,
+    page_size: int = 10000,
+) -> Iterator:
+    """Export data as Arrow record batches
+
+    The records are read by pages and each page is converted into a batch
+    with typed columns built from the field types: integers, floats,
+    booleans, dates, datetimes (timestamps), many2one (ids), x2many (lists of ids),
+    selections (dictionary encoded strings), other values as strings.
+    Fields without relations are read using search_read directly.
+    Requires pyarrow.
+
+    :param model: Odoo model
+    :param filter_or_domain: Either a domain or an ir.filer name
+    :param export_or_fields: Either a list of fields or an ir.exports name (see `export_data`)
+    :param page_size: Number of records read by each call and per batch (default: 10000)
+    :return: An iterator of pyarrow.RecordBatch
+    """
+    import pyarrow as pa
+
+    domain, fields = _export_parameters(model, filter_or_domain, export_or_fields)
+    names = [str(f) for f in fields]
+    schema = pa.schema([(name, _arrow_type(model, name)) for name in names])
+    if any('.' in name for name in names):
+        records = model.search_read_dict_iter(
+            domain, fields, page_size=page_size, batch_size=page_size
+        )
+        rows: Iterator[List] = flatten(records, fields)
+    else:
+        rows = (
+            [record.get(name) for name in names]
+            for record in model._search_read_iter(domain, names, page_size=page_size)
+        )
+    empty = True
+    while True:
+        page = list(itertools.islice(rows, page_size))
+        if not page:
+            if empty:
+                yield pa.RecordBatch.from_pylist([], schema=schema)
+            break
+        empty = False
+        columns = zip(*page)
+        yield pa.RecordBatch.from_arrays(
+            [_arrow_array(list(values), field.type) for values, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+
+def export_to_parquet(
+    model: OdooModel,
+    filter_or_domain: Union[str, List],
+    export_or_fields: Union[str, List[str]],
+    path: Union[str, Path],
+    *,
+    page_size: int = 10000,
+    compression: str = 'snappy',
+) -> int:
+    """Export data into a Parquet file
+
+    Each page of records is written as a row group (see `export_arrow_batches`),
+    so the memory used does not depend on the number of records.
+    Requires pyarrow.
+
+    :param model: Odoo model
+    :param filter_or_domain: Either a domain or an ir.filer name
+    :param export_or_fields: Either a list of fields or an ir.exports name (see `export_data`)
+    :param path: The path of the file
+    :param page_size: Number of records per row group (default: 10000)
+    :param compression: The compression codec (default: snappy)
+    :return: The number of rows written
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    log = logging.getLogger(__name__)
+    log.info('Export: write %s to %s', model.model, path)
+    count = 0
+    writer = None
+    try:
+        for batch in export_arrow_batches(
+            model, filter_or_domain, export_or_fields, page_size=page_size
+        ):
+            if writer is None:
+                writer = pq.ParquetWriter(str(path), batch.schema, compression=compression)
+            writer.write_table(pa.Table.from_batches([batch]))
+            count += batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    log.info('Export: done, %d rows', count)
+    return count
+
+
+class ExportState:
+    """State of exports stored in a JSON file
+
+    The state is a dict of values by key (for example, the model name)
+    and the file is written atomically each time a value is set.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """New state
+
+        :param path: The path of the JSON file
+        """
+        self.path = Path(path).expanduser()
+        try:
+            with open(self.path, 'r') as f:
+                self._data: Dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            self._data = {}
+
+    def get(self, key: str) -> Dict[str, Any]:
+        """Get the state for a key"""
+        return self._data.get(key) or {}
+
+    def set(self, key: str, value: Optional[Dict[str, Any]]):
+        """Set the state for a key (None to remove it) and save the file"""
+        if value is None:
+            self._data.pop(key, None)
+        else:
+            self._data[key] = value
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._data, f)
+        os.replace(tmp_name, self.path)
+
+    def __repr__(self) -> str:
+        return f"ExportState({self.path})"
+
+
+def export_changes(
+    model: OdooModel,
+    filter_or_domain: Union[str, List],
+    export_or_fields: Union[str, List[str]],
+    state: Union[str, Path, ExportState],
+    *,
+    with_header: bool = True,
+    expand_many: bool = False,
+    page_size: int = 1000,
+    detect_deletions: bool = True,
+    chunk_size: int = 10000,
+    margin: int = 60,
+    key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Export the records modified since the last export
+
+    The watermark of the last export (the greatest write_date) is kept in the state,
+    so that only the records with a write_date after it are read.
+    The first export reads all the records.
+
+    The write_date returned by the server is truncated to seconds and a transaction
+    committed late can write an earlier date, so the records are read from
+    `margin` seconds before the watermark, by pages ordered by id. The records
+    read in that window by the previous export are kept in the state with
+    a hash of their exported rows and skipped when the rows did not change.
+
+    To detect deletions, the known ids are kept in the state too.
+    They are compared by chunks: the records are counted in the id range of
+    each chunk and the ids are searched only when the count is different.
+    Records which do not match the domain anymore are reported as deleted.
+
+    The state is saved at the end of the export.
+
+    :param model: Odoo model
+    :param filter_or_domain: Either a domain or an ir.filer name
+    :param export_or_fields: Either a list of fields or an ir.exports name (see `export_data`)
+    :param state: The state or the path to its file
+    :param with_header: Include the header in the data (default: True)
+    :param expand_many: Flatten lists embedded in the result (default: False)
+    :param page_size: Number of records read by each call (default: 1000)
+    :param detect_deletions: Find the deleted records (default: True)
+    :param chunk_size: Number of known ids compared by each count (default: 10000)
+    :param margin: Number of seconds read again before the watermark (default: 60)
+    :param key: The key in the state (default: the model and a hash of the domain and fields)
+    :return: {'data': [rows], 'deleted_ids': [...], 'write_date': x}
+    """
+    log = logging.getLogger(__name__)
+    if not isinstance(state, ExportState):
+        state = ExportState(state)
+    domain, fields = _export_parameters(model, filter_or_domain, export_or_fields)
+    if key is None:
+        parameters = json.dumps([domain, [str(f) for f in fields]], default=str)
+        key = '%s/%s' % (model.model, hashlib.sha1(parameters.encode()).hexdigest()[:16])
+    model_state = state.get(key)
+    write_date = model_state.get('write_date') or ''
+    boundary: Dict[str, List[str]] = model_state.get('boundary') or {}
+    known_ids = set(model_state.get('ids') or [])
+
+    def window_start(value: str) -> str:
+        """The date from which records are read, before the watermark"""
+        start = decode_datetime(value)
+        return format_datetime(start - timedelta(seconds=margin)) if start else ''
+
+    since = window_start(write_date)
+    log.info('Export: read %s changed since %s', model.model, since or 'the start')
+    change_domain = ([('write_date', '>=', since)] if since else []) + list(domain)
+    data: List[List] = []
+    read_records: Dict[str, List[str]] = {}
+    last_id = 0
+    while True:
+        records = model.search_read_dict(
+            [('id', '>', last_id)] + change_domain,
+            fields + ['id', 'write_date'],
+            order='id',
+            limit=page_size,
+        )
+        if not records:
+            break
+        last_id = records[-1]['id']
+        known_ids.update(r['id'] for r in records)
+        for record in records:
+            record_date = record['write_date'] or ''
+            write_date = max(write_date, record_date)
+            rows = list(flatten([record], fields, expand_many=expand_many))
+            # the date is truncated to seconds, compare the exported values
+            digest = hashlib.sha1(json.dumps(rows, default=str).encode()).hexdigest()
+            if boundary.get(str(record['id'])) != [record_date, digest]:
+                data.extend(rows)
+            read_records[str(record['id'])] = [record_date, digest]
+        if len(records) < page_size:
+            break
+
+    deleted_ids: List[int] = []
+    if detect_deletions and known_ids:
+        ids = sorted(known_ids)
+        chunks = [ids[i : i + chunk_size] for i in range(0, len(ids), chunk_size)]
+        for chunk in chunks:
+            range_domain = [('id', '>=', chunk[0]), ('id', '<=', chunk[-1])] + list(domain)
+            if model.search_count(range_domain) == len(chunk):
+                continue
+            existing = set(model.search(range_domain))
+            deleted_ids.extend(i for i in chunk if i not in existing)
+        known_ids.difference_update(deleted_ids)
+        log.info('Export: %d deleted records', len(deleted_ids))
+
+    # keep the records of the next window, they are read again by the next export
+    since = window_start(write_date)
+    boundary.update(read_records)
+    for id in deleted_ids:
+        boundary.pop(str(id), None)
+    state.set(
+        key,
+        {
+            'write_date': write_date,
+            'boundary': {k: v for k, v in boundary.items() if v[0] >= since},
+            'ids': sorted(known_ids) if detect_deletions else [],
+        },
+    )
+    log.info('Export: done, %d rows', len(data))
+    if with_header:
+        data.insert(0, [str(f) for f in fields])
+    return {'data': data, 'deleted_ids': deleted_ids, 'write_date': write_date}
+
+
+def export_resumable(
+    model: OdooModel,
+    filter_or_domain: Union[str, List],
+    export_or_fields: Union[str, List[str]],
+    path: Union[str, Path],
+    format: str = 'csv',
+    *,
+    with_header: bool = True,
+    expand_many: bool = False,
+    page_size: int = 1000,
+    compress: Optional[bool] = None,
+    state: Union[None, str, Path, ExportState] = None,
+) -> int:
+    """Export data into a file, resuming the previous export if it was interrupted
+
+    The records are read by pages ordered by id and each page is appended
+    to the file (as a gzip member when compressed). After each page, the last id
+    and the size of the file are saved in the state. When the export is run again,
+    the file is truncated to the saved size and the export continues after
+    the last id, so pages already written are not read again.
+    If the file is missing or shorter than the saved size, the export starts again.
+    The state is removed when the export is complete.
+
+    :param model: Odoo model
+    :param filter_or_domain: Either a domain or an ir.filer name
+    :param export_or_fields: Either a list of fields or an ir.exports name (see `export_data`)
+    :param path: The path of the file
+    :param format: The format of the file: csv (default) or jsonl
+    :param with_header: Write the header in csv files (default: True)
+    :param expand_many: Flatten lists embedded in the result (default: False)
+    :param page_size: Number of records read by each call (default: 1000)
+    :param compress: Compress with gzip (default: when path ends with .gz)
+    :param state: The state or the path to its file (default: path + '.state.json')
+    :return: The number of rows in the file
+    """
+    log = logging.getLogger(__name__)
+    if format not in ('csv', 'jsonl'):
+        raise ValueError('Unsupported export format: %s' % format)
+    domain, fields = _export_parameters(model, filter_or_domain, export_or_fields)
+    path = Path(path)
+    if compress is None:
+        compress = path.suffix == '.gz'
+    default_state = state is None
+    if not isinstance(state, ExportState):
+        state = ExportState(state or path.with_name(path.name + '.state.json'))
+    names = [str(f) for f in fields]
+    key = str(path)
+    parameters = json.loads(
+        json.dumps(
+            {
+                'domain': domain,
+                'fields': names,
+                'format': format,
+                'compress': compress,
+                'expand_many': expand_many,
+                'with_header': with_header,
+            }
+        )
+    )
+
+    checkpoint = state.get(key)
+    if checkpoint and checkpoint.get('parameters') != parameters:
+        raise ValueError('Cannot resume the export of %s with other parameters' % path)
+    last_id = checkpoint.get('id', 0)
+    count = checkpoint.get('rows', 0)
+    size = checkpoint.get('size', 0)
+    if size and (not path.exists() or path.stat().st_size < size):
+        # the written pages are lost, start again
+        log.warning('Export: %s is shorter than the checkpoint, restart the export', path)
+        last_id = count = size = 0
+    elif checkpoint:
+        log.info('Export: resume %s after id %d, %d rows', model.model, last_id, count)
+    with open(path, 'ab') as f:
+        f.truncate(size)
+
+    def append(rows: Iterable[List], header: bool) -> int:
+        """Append rows to the file and return the number of rows"""
+        with open(path, 'ab') as raw_file:
+            file = cast(
+                IO[bytes], gzip.GzipFile(fileobj=raw_file, mode='wb') if compress else raw_file
+            )
+            written = _write_rows(file, rows, names, format, model.odoo.codec, header=header)
+            if compress:
+                # a gzip member per append
+                file.close()
+            raw_file.flush()
+            os.fsync(raw_file.fileno())
+        return written
+
+    header = with_header and not size
+    while True:
+        records = model.search_read_dict(
+            [('id', '>', last_id)] + list(domain),
+            fields + ['id'],
+            order='id',
+            limit=page_size,
+        )
+        if not records:
+            break
+        count += append(flatten(records, fields, expand_many=expand_many), header)
+        header = False
+        last_id = records[-1]['id']
+        size = path.stat().st_size
+        state.set(key, {'parameters': parameters, 'id': last_id, 'rows': count, 'size': size})
+        log.debug('Export: %d rows written', count)
+        if len(records) < page_size:
+            break
+    if header:
+        # no records, write the header only
+        append([], header)
+    state.set(key, None)
+    if default_state:
+        state.path.unlink()
+    log.info('Export: done, %d rows', count)
+    return count
+
+
 def add_fields(
     model: OdooModel, data: List[Dict], by_field: str, fields: List[str] = ['id'], domain: List = []
 ):
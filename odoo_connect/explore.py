@@ -1,28 +1,458 @@
+import sys
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import Any, Callable, Dict, Iterable, List, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    KeysView,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import odoo_connect.format
 
 from . import odoo_rpc
 
-__doc__ = """Interact more easily with Odoo records."""
+__doc__ = """Interact more easily with Odoo records.
+
+Read values are kept in a cache (`GLOBAL_CACHE`), which can be bounded:
+
+    GLOBAL_CACHE.set(RecordCache(max_records_per_model=10000, ttl=600))
+"""
+
+
+def _record_size(record: Dict[str, Any]) -> int:
+    """Estimate the memory used by a record (field names are shared)"""
+    return sys.getsizeof(record) + sum(sys.getsizeof(v) for v in record.values())
+
+
+class _CacheEntry:
+    __slots__ = ('record', 'time', 'used', 'size')
+
+    def __init__(self, record: Any, size: int):
+        self.record = record
+        self.time = self.used = time.monotonic()
+        self.size = size
+
+
+class ModelCache:
+    """Cache of the records of a model
+
+    Records are kept in least recently used order for eviction.
+    The fields that are read are counted to learn the hot fields of the model:
+    in lazy mode, they are read along with the requested ones.
+    """
+
+    def __init__(self, parent: "RecordCache", hot_fields: Iterable[str] = ()):
+        self._parent = parent
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        self.memory = 0
+        self.hot_fields: Set[str] = set(hot_fields)
+        self.field_stats: Counter[str] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, id: int) -> bool:
+        return self.__entry(id, count=False) is not None
+
+    def __getitem__(self, id: int) -> Dict[str, Any]:
+        entry = self.__entry(id)
+        if entry is None:
+            raise KeyError(id)
+        return self._load(entry.record)
+
+    def _store(self, record: Dict[str, Any]) -> Tuple[Any, int]:
+        """Convert a record to its stored value and estimate its size"""
+        return record, _record_size(record)
+
+    def _load(self, stored: Any) -> Dict[str, Any]:
+        """Convert a stored value to a record"""
+        return stored
+
+    def _release(self, stored: Any):
+        """Release a stored value"""
+        pass
+
+    def __entry(self, id: int, count=True) -> Optional[_CacheEntry]:
+        """Get an entry, checking its validity and marking it as recently used"""
+        parent = self._parent
+        entry = self._entries.get(id)
+        if entry is not None and parent.ttl and time.monotonic() - entry.time > parent.ttl:
+            self.pop(id)
+            parent.evictions += 1
+            entry = None
+        if entry is None:
+            if count:
+                parent.misses += 1
+            return None
+        self._entries.move_to_end(id)
+        entry.used = time.monotonic()
+        if count:
+            parent.hits += 1
+        return entry
+
+    def get(self, id: int, default=None) -> Optional[Dict[str, Any]]:
+        """Get a record"""
+        entry = self.__entry(id)
+        return default if entry is None else self._load(entry.record)
+
+    def peek(self, id: int) -> Optional[Dict[str, Any]]:
+        """Get a record without marking it as used"""
+        entry = self._entries.get(id)
+        return None if entry is None else self._load(entry.record)
+
+    def keys(self) -> KeysView[int]:
+        return self._entries.keys()
+
+    def use_fields(self, fields: Iterable[str]):
+        """Count that fields had to be read, they become hot after a few reads"""
+        threshold = self._parent.hot_threshold
+        for field in fields:
+            self.field_stats[field] += 1
+            if threshold and self.field_stats[field] >= threshold:
+                self.hot_fields.add(field)
+
+    def set(self, id: int, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Set a record"""
+        self.pop(id)
+        entry = _CacheEntry(*self._store(record))
+        self._entries[id] = entry
+        self.memory += entry.size
+        self._parent._added(self, entry.size)
+        return record
+
+    def update(self, records: Dict[int, Dict[str, Any]]):
+        """Set multiple records"""
+        for id, record in records.items():
+            self.set(id, record)
+
+    def update_record(self, id: int, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Update the values of a record (or set it) and return the record"""
+        # expired values are not merged
+        entry = self.__entry(id, count=False)
+        if entry is None:
+            return self.set(id, values)
+        return self.set(id, {**self._load(entry.record), **values})
+
+    def pop(self, id: int, default=None) -> Optional[Dict[str, Any]]:
+        """Remove a record"""
+        entry = self._entries.pop(id, None)
+        if entry is None:
+            return default
+        self.memory -= entry.size
+        self._parent.memory -= entry.size
+        record = self._load(entry.record)
+        self._release(entry.record)
+        return record
+
+    def _pop_oldest(self):
+        """Remove the least recently used record"""
+        if self._entries:
+            self.pop(next(iter(self._entries)))
+            self._parent.evictions += 1
+
+    def _oldest_use(self) -> float:
+        """Last use of the least recently used record"""
+        return next((e.used for e in self._entries.values()), 0)
+
+    def clear(self):
+        """Remove all records"""
+        self._parent.memory -= self.memory
+        self._entries.clear()
+        self.memory = 0
+
+
+_MISSING = object()
+
+
+class ColumnarModelCache(ModelCache):
+    """Cache of the records of a model stored in columns
+
+    Values are stored in a list per field and each record is a row index,
+    so field names are not repeated for each record. Records are
+    returned as new dictionaries.
+    """
+
+    def __init__(self, parent: "RecordCache", hot_fields: Iterable[str] = ()):
+        super().__init__(parent, hot_fields)
+        self._columns: Dict[str, List[Any]] = {}
+        self._row_count = 0
+        self._free_rows: List[int] = []
+
+    def _store(self, record: Dict[str, Any]) -> Tuple[Any, int]:
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = self._row_count
+            self._row_count += 1
+            for column in self._columns.values():
+                column.append(_MISSING)
+        size = 0
+        for field, value in record.items():
+            if field not in self._columns:
+                self._columns[field] = [_MISSING] * self._row_count
+            self._columns[field][row] = value
+            # a pointer in the column and the value
+            size += 8 + sys.getsizeof(value)
+        return row, size
+
+    def _load(self, stored: Any) -> Dict[str, Any]:
+        return {
+            field: column[stored]
+            for field, column in self._columns.items()
+            if column[stored] is not _MISSING
+        }
+
+    def _release(self, stored: Any):
+        for column in self._columns.values():
+            column[stored] = _MISSING
+        self._free_rows.append(stored)
+
+    def clear(self):
+        super().clear()
+        self._columns.clear()
+        self._row_count = 0
+        self._free_rows.clear()
+
+
+class RecordCache:
+    """Cache of records of all models
+
+    The cache can be bounded by a maximum number of records per model,
+    a maximum estimated memory size (in bytes) and a time to live (in seconds).
+    When a limit is reached, the least recently used records are evicted.
+
+    By default, all the stored fields of records are read when a value is
+    missing. In lazy mode, only the requested fields and the hot fields
+    of the model are read.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_records_per_model: int = 0,
+        max_memory: int = 0,
+        ttl: float = 0,
+        columnar: bool = False,
+        lazy: bool = False,
+        hot_fields: Optional[Dict[str, Iterable[str]]] = None,
+        hot_threshold: int = 2,
+    ):
+        """New cache
+
+        :param max_records_per_model: Maximum number of records per model (default: no limit)
+        :param max_memory: Maximum estimated memory in bytes (default: no limit)
+        :param ttl: Time to live of a record in seconds (default: no limit)
+        :param columnar: Store the values in columns to use less memory for many records
+        :param lazy: Read only the requested and hot fields
+        :param hot_fields: Fields always read in lazy mode by model name
+        :param hot_threshold: Number of reads of a field to make it hot (0 to disable)
+        """
+        self.max_records_per_model = max_records_per_model
+        self.max_memory = max_memory
+        self.ttl = ttl
+        self.columnar = columnar
+        self.lazy = lazy
+        self.hot_fields = hot_fields or {}
+        self.hot_threshold = hot_threshold
+        self.models: Dict[odoo_rpc.OdooModel, ModelCache] = {}
+        self.memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def model(self, model: odoo_rpc.OdooModel) -> ModelCache:
+        """Get the cache for a model"""
+        model_cache = self.models.get(model)
+        if model_cache is None:
+            cls = ColumnarModelCache if self.columnar else ModelCache
+            model_cache = cls(self, self.hot_fields.get(model.model, ()))
+            self.models[model] = model_cache
+        return model_cache
+
+    def _added(self, model_cache: ModelCache, size: int):
+        """Apply the limits after adding a record"""
+        self.memory += size
+        if self.max_records_per_model:
+            while len(model_cache) > self.max_records_per_model:
+                model_cache._pop_oldest()
+        if self.max_memory:
+            while self.memory > self.max_memory and self.memory > size:
+                # evict from the model having the least recently used record
+                oldest = min(
+                    (c for c in self.models.values() if len(c)), key=ModelCache._oldest_use
+                )
+                oldest._pop_oldest()
+
+    def invalidate(self, model: odoo_rpc.OdooModel, ids: Optional[Iterable[int]] = None):
+        """Invalidate the cache for a set of ids or all the model"""
+        model_cache = self.models.get(model)
+        if not model_cache:
+            return
+        if ids is None:
+            model_cache.clear()
+        else:
+            for id in ids:
+                model_cache.pop(id)
+
+    def clear(self):
+        """Remove all records and reset the counters"""
+        for model_cache in self.models.values():
+            model_cache.clear()
+        self.models.clear()
+        self.memory = self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Get the statistics of the cache"""
+        return {
+            'records': sum(len(c) for c in self.models.values()),
+            'memory': self.memory,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def __repr__(self) -> str:
+        return f"RecordCache({self.stats()})"
 
 
 """Cache of read values"""
-GLOBAL_CACHE: ContextVar[Dict[odoo_rpc.OdooModel, Dict[int, Dict[str, Any]]]] = ContextVar(
-    "OdooExploreCache", default={}
-)
+GLOBAL_CACHE: ContextVar[RecordCache] = ContextVar("OdooExploreCache", default=RecordCache())
+
+"""Maximum number of records read at once from a prefetch group"""
+PREFETCH_MAX = 1000
+
+
+class _LazyIds:
+    """Prefetch group computed when it is first used"""
+
+    def __init__(self, compute: Callable[[], List[int]]):
+        self._compute: Optional[Callable[[], List[int]]] = compute
+        self._ids: List[int] = []
+
+    def get(self) -> List[int]:
+        if self._compute is not None:
+            self._ids = self._compute()
+            self._compute = None
+        return self._ids
+
+
+class WriteBatch:
+    """Pending writes of instances (see `batch`)
+
+    The writes are kept in the order of the calls, as segments of writes
+    on the same model. In a segment, values written on the same record are merged
+    and records receiving the same values are updated with a single write call.
+    """
+
+    def __init__(self):
+        self.pending: List[Tuple[odoo_rpc.OdooModel, Dict[int, Dict[str, Any]]]] = []
+
+    def __len__(self) -> int:
+        return sum(len(records) for _model, records in self.pending)
+
+    def add(self, model: odoo_rpc.OdooModel, ids: List[int], values: Dict[str, Any]):
+        """Add values to write on records"""
+        if not self.pending or self.pending[-1][0] is not model:
+            self.pending.append((model, {}))
+        records = self.pending[-1][1]
+        for id in ids:
+            record = records.setdefault(id, {})
+            for field, value in values.items():
+                old_value = record.get(field)
+                if isinstance(old_value, list) and isinstance(value, list):
+                    # x2many commands are applied one after the other
+                    record[field] = old_value + value
+                else:
+                    record[field] = value
+
+    def flush(self):
+        """Write the pending values
+
+        The writes are removed once executed, so when a write fails,
+        it stays pending with the following ones.
+        """
+        while self.pending:
+            model, records = self.pending[0]
+            groups: Dict[str, Tuple[Dict[str, Any], List[int]]] = {}
+            for id, values in records.items():
+                key = repr(sorted(values.items()))
+                groups.setdefault(key, (values, []))[1].append(id)
+            for values, ids in groups.values():
+                model.write(ids, values)
+                for id in ids:
+                    del records[id]
+                GLOBAL_CACHE.get().invalidate(model, ids)
+            self.pending.pop(0)
+
+
+"""Current batch of writes"""
+GLOBAL_BATCH: ContextVar[Optional[WriteBatch]] = ContextVar("OdooExploreBatch", default=None)
+
+
+@contextmanager
+def batch() -> Iterator[WriteBatch]:
+    """Delay the writes of instances until the end of the block
+
+    Pending writes are flushed at the end of the block or before reading
+    data from the server. When an exception is raised inside the block,
+    the pending writes are discarded. Nested blocks use the same batch.
+
+        with batch():
+            for order in orders:
+                order.note = 'ok'
+    """
+    current = GLOBAL_BATCH.get()
+    if current is not None:
+        yield current
+        return
+    write_batch = WriteBatch()
+    token = GLOBAL_BATCH.set(write_batch)
+    try:
+        yield write_batch
+    finally:
+        GLOBAL_BATCH.reset(token)
+    write_batch.flush()
+
+
+def _flush_batch():
+    """Flush pending writes before making a call to the server"""
+    write_batch = GLOBAL_BATCH.get()
+    if write_batch:
+        write_batch.flush()
 
 
 class Instance:
-    """A proxy for an instance set"""
+    """A proxy for an instance set
+
+    Each instance has a prefetch group: the ids of the set it originates from.
+    When a value is missing in the cache, it is read for all the records of
+    the group that miss it (as the Odoo ORM does), so iterating over a set
+    and reading fields of each record does not make a call per record.
+    """
 
     __model: odoo_rpc.OdooModel
     __ids: List[int]
-
-    def __init__(self, model: odoo_rpc.OdooModel, ids: List[int]) -> None:
+    __prefetch_ids: Union[List[int], _LazyIds]
+
+    def __init__(
+        self,
+        model: odoo_rpc.OdooModel,
+        ids: List[int],
+        prefetch_ids: Union[None, List[int], _LazyIds] = None,
+    ) -> None:
         self.__model = model
         self.__ids = ids
+        self.__prefetch_ids = ids if prefetch_ids is None else prefetch_ids
 
     def __bool__(self) -> bool:
         return bool(self.__ids)
@@ -67,6 +497,15 @@ class Instance:
     def _model(self) -> odoo_rpc.OdooModel:
         return self.__model
 
+    @property
+    def _prefetch_ids(self) -> List[int]:
+        prefetch_ids = self.__prefetch_ids
+        return prefetch_ids.get() if isinstance(prefetch_ids, _LazyIds) else prefetch_ids
+
+    def with_prefetch(self, prefetch_ids: Optional[List[int]] = None) -> "Instance":
+        """Return the same records with another prefetch group (default: own ids)"""
+        return Instance(self.__model, self.__ids, prefetch_ids)
+
     def _formatter(self) -> odoo_connect.format.Formatter:
         return odoo_connect.format.get_default_formatter(self._model)
 
@@ -74,7 +513,7 @@ class Instance:
         ids = self.__ids[item]
         if not isinstance(ids, Iterable):
             ids = [ids]
-        return Instance(self.__model, ids)
+        return Instance(self.__model, ids, self.__prefetch_ids)
 
     def __getattr__(self, __name: str) -> Any:
         value = self._mapped(__name)
@@ -128,36 +567,86 @@ class Instance:
         relation = prop.get('relation')
         if relation:
             model = self.__model.odoo.get_model(relation)
-            # value is either list[int] (many) or int|False (one)
-            lists = (v if isinstance(v, list) else [v] for v in values if v)
-            ids = set(i for ls in lists for i in ls)
-            return Instance(model, list(ids))
+            ids = _relation_ids(values)
+            prefetch_ids: Optional[_LazyIds] = None
+            if self.__prefetch_ids is not self.__ids:
+                # the related records of the prefetch group form the new group,
+                # computed only when the related records are missing in the cache
+                def related_group() -> List[int]:
+                    model_cache = self.__cache()
+                    prefetch_values = (
+                        (model_cache.peek(i) or {}).get(field_name)
+                        for i in self.__prefetch_window()
+                    )
+                    id_set = set(ids)
+                    return ids + [i for i in _relation_ids(prefetch_values) if i not in id_set]
+
+                prefetch_ids = _LazyIds(related_group)
+            return Instance(model, ids, prefetch_ids)
         return values
 
     def cache(self, fields: List[str] = [], computed=False, exists=False) -> "Instance":
         """Cache the record fields and return self"""
-        fieldset = set(self._default_fields(computed=computed) + fields)
+        self.__fetch(fields, computed=computed)
+        return self
+
+    def __fetch(self, fields: List[str] = [], computed=False) -> Dict[int, Dict[str, Any]]:
+        """Get the records from the cache, read the missing ones
+
+        :return: The existing records by id
+        """
         model_cache = self.__cache()
+        if fields and GLOBAL_CACHE.get().lazy:
+            fieldset = {'id', *fields, *model_cache.hot_fields}
+        else:
+            fieldset = set(self._default_fields(computed=computed) + fields)
+        records = {}
         # find missing ids, when missing in cache or field missing in cache
         # read all at once to have more consistency and avoid roundtrips
-        missing_ids = set(i for i in self.__ids if fieldset - model_cache.get(i, {}).keys())
-        # an exists() check is not needed because read() will return only existing rows
+        missing_ids = set()
+        for i in self.__ids:
+            record = model_cache.get(i)
+            if record is None or fieldset - record.keys():
+                missing_ids.add(i)
+            else:
+                records[i] = record
         if not missing_ids:
-            return self
+            return records
+        if self.__prefetch_ids is not self.__ids:
+            # read also the records of the prefetch group missing the fields
+            for i in self.__prefetch_window():
+                if len(missing_ids) >= PREFETCH_MAX:
+                    break
+                if i in missing_ids or i in records:
+                    continue
+                record = model_cache.peek(i)
+                if record is None or fieldset - record.keys():
+                    missing_ids.add(i)
+        model_cache.use_fields(fields)
+        _flush_batch()
+        # an exists() check is not needed because read() will return only existing rows
         for d in self.__model._read(list(missing_ids), list(fieldset)):
-            id = d['id']
-            if id in model_cache:
-                model_cache[id].update(d)
-            else:
-                model_cache[id] = d
-        return self
+            records[d['id']] = model_cache.update_record(d['id'], d)
+        return records
+
+    def __prefetch_window(self) -> List[int]:
+        """Part of the prefetch group read with the records
+
+        The window starts at the first record, so that iterating over the group
+        reads the next PREFETCH_MAX records at once.
+        """
+        prefetch_ids = self._prefetch_ids
+        try:
+            start = prefetch_ids.index(self.__ids[0]) if self.__ids else 0
+        except ValueError:
+            start = 0
+        return prefetch_ids[start : start + PREFETCH_MAX]
 
     def read(self, *, check_fields: List[str] = []) -> List[Dict[str, Any]]:
         """Read the data"""
-        self.cache(fields=check_fields)
-        model_cache = self.__cache()
+        records = self.__fetch(check_fields)
         try:
-            return [model_cache[i] for i in self.__ids]
+            return [records[i] for i in self.__ids]
         except KeyError as e:
             raise odoo_rpc.OdooServerError(f"Cannot read {self.__model.model}: {e}")
 
@@ -187,23 +676,27 @@ class Instance:
         """Return only existing records"""
         # re-read records to validate
         self.invalidate_cache(self.__ids)
-        self.cache(computed=False, exists=True)
-        model_cache = self.__cache()
-        ids = set(self.__ids) & model_cache.keys()
+        records = self.__fetch(computed=False)
+        ids = set(self.__ids) & records.keys()
         return self.browse(*ids) if len(ids) < len(self.__ids) else self
 
     def search(self, domain: List, **kw) -> "Instance":
         """Search for an instance"""
-        fields = self._default_fields()
+        _flush_batch()
+        model_cache = self.__cache()
+        if GLOBAL_CACHE.get().lazy:
+            fields = ['id', *model_cache.hot_fields]
+        else:
+            fields = self._default_fields()
         data = self.__model._search_read(domain, fields, **kw)
         # add only new data, keep cache consistent
-        model_cache = self.__cache()
         model_cache.update({d['id']: d for d in data if d['id'] not in model_cache})
         return Instance(self.__model, [d['id'] for d in data])
 
     def name_search(self, name: str, **kw) -> "Instance":
         """Search by name"""
         # search and return only the ids
+        _flush_batch()
         data = self.__model.name_search(name, **kw)
         return Instance(self.__model, [d[0] for d in data])
 
@@ -216,65 +709,70 @@ class Instance:
             value_list = [formatter(d) for d in values]
         else:
             value_list = list(values)
+        _flush_batch()
         ids = self.__model.create(value_list)
         return self.browse(*ids)
 
     def write(self, values: Dict[str, Any], *, format: bool = False):
-        """Update the values of the current instance"""
+        """Update the values of the current instance
+
+        Inside a `batch()` block, the write is delayed.
+        """
         if not values:
             return
         if format:
             values = self._formatter().format_dict(values)
-        self.__model.write(self.__ids, values)
+        write_batch = GLOBAL_BATCH.get()
+        if write_batch is not None:
+            write_batch.add(self.__model, self.__ids, values)
+        else:
+            self.__model.write(self.__ids, values)
         self.invalidate_cache(self.__ids)
 
+    def batch(self):
+        """Delay the writes until the end of the block (see `batch`)"""
+        return batch()
+
     def unlink(self):
         """Remove the records from the database"""
+        _flush_batch()
         self.invalidate_cache(self.__ids)
         self.__model.unlink(self.__ids)
 
     def copy(self):
         """Copy the records in the database"""
+        _flush_batch()
         ids = self.__model.copy(self.__ids)
         return self.browse(*ids)
 
-    def __cache(self) -> Dict[int, Dict[str, Any]]:
-        cache = GLOBAL_CACHE.get()
-        model_cache = cache.get(self.__model)
-        if not model_cache:
-            cache[self.__model] = model_cache = {}
-        return model_cache
+    def __cache(self) -> ModelCache:
+        return GLOBAL_CACHE.get().model(self.__model)
 
     def invalidate_cache(self, ids=None):
         """Invalidate the cache for a set of ids or all the model"""
-        model_cache = GLOBAL_CACHE.get().get(self.__model)
-        if not model_cache:
-            return
-        if ids is None:
-            model_cache.clear()
-        else:
-            for id in ids:
-                model_cache.pop(id, None)
+        GLOBAL_CACHE.get().invalidate(self.__model, ids)
 
     def filtered(self, predicate: Callable[["Instance"], bool]) -> "Instance":
         """Filter the records"""
 
         def _predicate(i):
-            return predicate(self.browse(i))
+            return predicate(Instance(self.__model, [i], self.__prefetch_ids))
 
-        self.cache(computed=False)
+        if not GLOBAL_CACHE.get().lazy:
+            self.cache(computed=False)
         ids = list(filter(_predicate, self.__ids))
-        return Instance(self.__model, ids)
+        return Instance(self.__model, ids, self.__prefetch_ids)
 
     def sorted(self, order: Callable[["Instance"], Any]) -> "Instance":
         """Sort the objects by a field"""
 
         def sorted_key(i):
-            return order(self.browse(i))
+            return order(Instance(self.__model, [i], self.__prefetch_ids))
 
-        self.cache(computed=False)
+        if not GLOBAL_CACHE.get().lazy:
+            self.cache(computed=False)
         ids = sorted(self.__ids, key=sorted_key)
-        return Instance(self.__model, ids)
+        return Instance(self.__model, ids, self.__prefetch_ids)
 
     def get_attachments(self) -> "Instance":
         """Return ir.attachment linked to this instance"""
@@ -291,6 +789,7 @@ class Instance:
 
         :param model_method: Whether to don't pass ids
         """
+        _flush_batch()
         if model_method:
             return self.__model.execute(method, *args, **kw)
         return self.__model.execute(method, self.ids, *args, **kw)
@@ -299,9 +798,16 @@ class Instance:
         return repr(self.__model) + str(self.__ids)
 
 
+def _relation_ids(values: Iterable[Any]) -> List[int]:
+    """Get the ids from values of a relational field"""
+    # value is either list[int] (many) or int|False (one)
+    lists = (v if isinstance(v, list) else [v] for v in values if v)
+    return list(set(i for ls in lists for i in ls))
+
+
 def explore(model: odoo_rpc.OdooModel) -> Instance:
     """Create an empty instance to explore"""
     return Instance(model, [])
 
 
-__all__ = ['explore']
+__all__ = ['explore', 'batch', 'RecordCache', 'GLOBAL_CACHE']
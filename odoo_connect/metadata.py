@@ -0,0 +1,193 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    from .odoo_rpc import OdooClient
+
+__doc__ = """Cache of the metadata of models (fields_get).
+
+The fields of models are kept in a registry shared by all the clients
+of the process connected with the same user. They can also be stored on disk
+so that short-lived processes do not need to fetch them from the server on each start.
+"""
+
+
+class MetadataRegistry:
+    """Registry of the fields of models shared by clients
+
+    The fields are stored by (url, database, model, uid, lang), so clients
+    connected to the same database with the same user share the same information.
+    Odoo filters the fields by the groups of the user, so the fields are
+    not shared between users.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fields: Dict[Tuple[str, str, str, int, str], Tuple[bool, Dict]] = {}
+
+    @staticmethod
+    def _key(odoo: Any, model: str) -> Tuple[str, str, str, int, str]:
+        return (
+            odoo.url,
+            odoo.database,
+            model,
+            odoo._uid or 0,
+            str(odoo.context.get('lang') or ''),
+        )
+
+    def get(self, odoo: Any, model: str, extended: bool = False) -> Optional[Dict]:
+        """Get the fields of a model
+
+        :param odoo: The client (synchronous or asynchronous)
+        :param model: The model name
+        :param extended: Whether all the attributes of the fields are needed
+        :return: The fields or None if not in the registry
+        """
+        entry = self._fields.get(self._key(odoo, model))
+        if not entry or (extended and not entry[0]):
+            return None
+        return entry[1]
+
+    def set(self, odoo: Any, model: str, fields: Dict, extended: bool = False):
+        """Store the fields of a model"""
+        with self._lock:
+            self._fields[self._key(odoo, model)] = (extended, fields)
+
+    def invalidate(
+        self, url: Optional[str] = None, database: Optional[str] = None, model: Optional[str] = None
+    ):
+        """Remove fields from the registry
+
+        :param url: Filter on the url of the server (default: all)
+        :param database: Filter on the database (default: all)
+        :param model: Filter on the model name (default: all)
+        """
+        with self._lock:
+            for key in list(self._fields):
+                if (
+                    (url is None or key[0] == url)
+                    and (database is None or key[1] == database)
+                    and (model is None or key[2] == model)
+                ):
+                    del self._fields[key]
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return f"MetadataRegistry({len(self)} models)"
+
+
+"""Registry used by default by the clients"""
+METADATA_REGISTRY = MetadataRegistry()
+
+
+class DiskMetadataCache:
+    """Persistent cache of the fields of models stored in a directory
+
+    A JSON file is stored for each state of a database; the key is computed
+    from the url, the database, the user, the server version, the installed modules
+    and the language. Installing or upgrading a module changes the key,
+    so the cache is never stale.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """New disk cache
+
+        :param path: The directory where the files are stored
+        """
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._keys: Dict[Tuple[str, str, int, str], Optional[str]] = {}
+        self._files: Dict[str, Dict[str, Dict]] = {}
+
+    def _key(self, odoo: "OdooClient") -> Optional[str]:
+        """Compute the key for the current state of the database
+
+        :return: The key or None if it cannot be determined
+        """
+        lang = str(odoo.context.get('lang') or '')
+        uid = odoo._uid or 0
+        client_key = (odoo.url, odoo.database, uid, lang)
+        if client_key in self._keys:
+            return self._keys[client_key]
+        from .odoo_rpc import OdooServerError
+
+        try:
+            version = odoo.version().get('server_version', '')
+            modules = odoo.get_model('ir.module.module').search_read(
+                [('state', '=', 'installed')], ['name', 'latest_version']
+            )
+        except OdooServerError as e:
+            logging.getLogger(__name__).debug('Cannot compute the metadata cache key: %s', e)
+            key = None
+        else:
+            module_list = sorted('%s:%s' % (m['name'], m['latest_version']) for m in modules)
+            data = json.dumps([odoo.url, odoo.database, uid, version, lang, module_list])
+            key = hashlib.sha256(data.encode()).hexdigest()
+        self._keys[client_key] = key
+        return key
+
+    def _load(self, key: str) -> Dict[str, Dict]:
+        """Load the file for a key"""
+        data = self._files.get(key)
+        if data is None:
+            try:
+                with open(self.path / f"{key}.json", 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            self._files[key] = data
+        return data
+
+    def get(self, odoo: "OdooClient", model: str, extended: bool = False) -> Optional[Dict]:
+        """Get the fields of a model
+
+        :param odoo: The client
+        :param model: The model name
+        :param extended: Whether all the attributes of the fields are needed
+        :return: The fields or None if not in the cache
+        """
+        with self._lock:
+            key = self._key(odoo)
+            if not key:
+                return None
+            entry = self._load(key).get(model)
+        if not entry or (extended and not entry.get('extended')):
+            return None
+        return entry['fields']
+
+    def set(self, odoo: "OdooClient", model: str, fields: Dict, extended: bool = False):
+        """Store the fields of a model"""
+        with self._lock:
+            key = self._key(odoo)
+            if not key:
+                return
+            data = self._load(key)
+            data[model] = {'extended': extended, 'fields': fields}
+            # write atomically, other processes may read the file
+            self.path.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_name, self.path / f"{key}.json")
+
+    def clear(self):
+        """Remove all the cached files"""
+        with self._lock:
+            self._keys.clear()
+            self._files.clear()
+            for file in self.path.glob('*.json'):
+                file.unlink()
+
+    def __repr__(self) -> str:
+        return f"DiskMetadataCache({self.path})"
+
+
+__all__ = ['DiskMetadataCache', 'MetadataRegistry', 'METADATA_REGISTRY']
@@ -1,12 +1,38 @@
+import json
 import logging
 import random
 import re
-from typing import Any, Dict, List, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .metadata import METADATA_REGISTRY, DiskMetadataCache, MetadataRegistry
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 __doc__ = """RPC class for Odoo"""
 
+T = TypeVar('T')
+R = TypeVar('R')
+
 
 def urljoin(base: str, *parts) -> str:
     """Simple URL joining"""
@@ -17,6 +43,40 @@ def urljoin(base: str, *parts) -> str:
     return "/".join([base] + [p.strip("/") for p in parts])
 
 
+_parallel_state = threading.local()
+
+
+def parallel_map(func: Callable[[T], R], items: Iterable[T], max_workers: int = 1) -> List[R]:
+    """Apply a function to each item using a pool of threads
+
+    Calls nested in a function already running in a pool are executed
+    sequentially, so the number of concurrent requests stays bounded
+    by the outermost max_workers.
+
+    :param func: The function to apply
+    :param items: The items
+    :param max_workers: Maximum number of threads (default: 1, no threads)
+    :return: The list of results, in the same order as the items
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1 or getattr(_parallel_state, 'nested', False):
+        return [func(item) for item in items]
+
+    def call(item: T) -> R:
+        _parallel_state.nested = True
+        return func(item)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+def _chunks(items: List[T], size: int) -> List[List[T]]:
+    """Split a list into chunks of a maximum size (no split when size is 0)"""
+    if not size or len(items) <= size:
+        return [items]
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
 def get_month(value: str) -> int:
     """Get the month number from a month name"""
     month = value.lower()[:3]
@@ -50,10 +110,165 @@ class OdooServerError(RuntimeError):
         return dat.get('debug')
 
 
+class JsonCodec:
+    """JSON serialization of the RPC messages (using the standard library)"""
+
+    name = 'json'
+
+    def dumps(self, value: Any) -> bytes:
+        """Serialize a value"""
+        return json.dumps(value).encode()
+
+    def loads(self, data: bytes) -> Any:
+        """Deserialize a value"""
+        return json.loads(data)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name})"
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON serialization using orjson"""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, value: Any) -> bytes:
+        return self._orjson.dumps(value, option=self._options)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    """JSON serialization using ujson"""
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def dumps(self, value: Any) -> bytes:
+        return self._ujson.dumps(value).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return self._ujson.loads(data)
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """Get a JSON codec by name
+
+    :param name: The name of the codec (json, orjson, ujson),
+                 when not set, use the fastest one installed
+    :return: The codec
+    """
+    codecs = [OrjsonCodec, UjsonCodec, JsonCodec]
+    if name:
+        codec_class = next((c for c in codecs if c.name == name), None)
+        if codec_class is None:
+            raise ValueError('Unknown JSON codec: %s' % name)
+        return codec_class()
+    for codec_class in codecs:
+        try:
+            return codec_class()
+        except ImportError:
+            continue
+    return JsonCodec()
+
+
+class Transport:
+    """HTTP transport settings used by the clients to create their session
+
+    By default, a `requests.Session` is created with a connection pool,
+    set `pool_maxsize` to the number of threads sharing the client.
+    You can swap the backend by giving a `session_factory` returning
+    a requests-compatible session; it must be thread-safe when the client
+    makes concurrent calls (see `OdooClient.max_workers`).
+    """
+
+    def __init__(
+        self,
+        *,
+        session_factory: Optional[Callable[[], Any]] = None,
+        async_session_factory: Optional[Callable[[], Any]] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 0,
+        keep_alive: bool = True,
+        timeout: Optional[float] = None,
+    ):
+        """New transport
+
+        :param session_factory: Function creating the session (default: requests.Session)
+        :param async_session_factory: Function creating the session for the asynchronous client
+               (default: httpx.AsyncClient)
+        :param pool_connections: Number of connection pools to cache (one per host)
+        :param pool_maxsize: Maximum number of connections per host
+        :param max_retries: Number of retries on connection errors
+        :param keep_alive: Whether to keep the connections alive between calls
+        :param timeout: Timeout in seconds for the requests (default: no timeout)
+        """
+        self.session_factory = session_factory
+        self.async_session_factory = async_session_factory
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+    def create_session(self):
+        """Create a new session"""
+        if self.session_factory:
+            session = self.session_factory()
+        else:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                max_retries=self.max_retries,
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def create_async_session(self):
+        """Create a new session for the asynchronous client"""
+        if self.async_session_factory:
+            return self.async_session_factory()
+        import httpx
+
+        limits = httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0,
+        )
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=self.max_retries),
+        )
+
+    def __repr__(self) -> str:
+        return f"Transport(pool_maxsize={self.pool_maxsize},timeout={self.timeout})"
+
+
 class OdooClient:
     """Odoo server connection"""
 
     url: str
+    transport: Transport
+    codec: JsonCodec
+    max_workers: int
+    read_chunk_size: int
+    metadata_cache: Optional[DiskMetadataCache]
+    metadata_registry: MetadataRegistry
     _models: Dict[str, "OdooModel"]
     _version: Dict[str, Any]
     _database: str
@@ -66,9 +281,22 @@ class OdooClient:
         self,
         url: str,
         database: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        codec: Optional[JsonCodec] = None,
+        metadata_cache: Optional[DiskMetadataCache] = None,
+        metadata_registry: Optional[MetadataRegistry] = None,
     ):
         """Create new connection."""
         self.url = url
+        self.transport = transport or Transport()
+        self.codec = codec or get_codec()
+        self.metadata_cache = metadata_cache
+        self.metadata_registry = metadata_registry or METADATA_REGISTRY
+        # maximum number of concurrent calls made by a single operation,
+        # the threads share the session of the transport (default: 1, no threads)
+        self.max_workers = 1
+        # maximum number of records read by a single call (0 for no limit)
+        self.read_chunk_size = 5000
         self.context = {}
         self._database = database or ''
         self._models = {}
@@ -86,7 +314,7 @@ class OdooClient:
     def _init_session(self):
         """Initialize the session"""
         self.__json_url = urljoin(self.url, "jsonrpc")
-        self.session = requests.Session()
+        self.session = self.transport.create_session()
 
     def _find_default_database(self, *, monodb=True) -> str:
         """Find the default database from the server or raise an exception"""
@@ -137,33 +365,65 @@ class OdooClient:
             raise OdooServerError('Failed to authenticate user %s' % username)
         log.info("Login successful [%s], [%s] uid: %d", self.url, self.username, self._uid)
 
-    def _json_rpc(self, method: str, params: Any):
-        """Make a jsonrpc call"""
+    def __json_rpc_data(self, method: str, params: Any) -> bytes:
+        """Serialize the jsonrpc request"""
         data = {
             "jsonrpc": "2.0",
             "method": method,
             "params": params,
             "id": random.randint(0, 1000000000),
         }
-        resp = self.session.post(self.__json_url, json=data)
+        return self.codec.dumps(data)
+
+    def _json_rpc(self, method: str, params: Any):
+        """Make a jsonrpc call"""
+        resp = self.session.post(
+            self.__json_url,
+            data=self.__json_rpc_data(method, params),
+            headers={'Content-Type': 'application/json'},
+            timeout=self.transport.timeout,
+        )
         resp.raise_for_status()
-        reply = resp.json()
+        reply = self.codec.loads(resp.content)
         if reply.get("error"):
             raise OdooServerError(reply["error"])
         return reply.get("result", None)
 
+    def _json_rpc_iter(self, method: str, params: Any) -> Iterator:
+        """Make a jsonrpc call and iterate over the items of the result
+
+        When ijson is installed, the response is parsed incrementally
+        while reading it from the socket, otherwise the reply is fully loaded.
+        """
+        if ijson is None:
+            yield from self._json_rpc(method, params) or []
+            return
+        resp = self.session.post(
+            self.__json_url,
+            data=self.__json_rpc_data(method, params),
+            headers={'Content-Type': 'application/json'},
+            timeout=self.transport.timeout,
+            stream=True,
+        )
+        with resp:
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            yield from _iter_json_rpc_result(resp.raw)
+
     def _call(self, service: str, method: str, *args):
         return self._json_rpc("call", {"service": service, "method": method, "args": args})
 
-    def _execute_kw(self, model: str, method: str, *args, **kw):
-        """Execute a method on a model"""
+    def _call_iter(self, service: str, method: str, *args) -> Iterator:
+        """Call a method and iterate over the items of the result"""
+        return self._json_rpc_iter("call", {"service": service, "method": method, "args": args})
+
+    def __execute_kw_args(self, model: str, method: str, args, kw) -> tuple:
+        """Arguments for an execute_kw call"""
         if not self._uid:
             raise RuntimeError('You must authenticate first')
         if self.context and 'context' not in kw:
             kw['context'] = self.context
-        return self._call(
-            "object",
-            "execute_kw",
+        return (
             self._database,
             self._uid,
             self._password,
@@ -173,6 +433,16 @@ class OdooClient:
             kw,
         )
 
+    def _execute_kw(self, model: str, method: str, *args, **kw):
+        """Execute a method on a model"""
+        return self._call("object", "execute_kw", *self.__execute_kw_args(model, method, args, kw))
+
+    def _execute_kw_iter(self, model: str, method: str, *args, **kw) -> Iterator:
+        """Execute a method on a model and iterate over the items of the result"""
+        return self._call_iter(
+            "object", "execute_kw", *self.__execute_kw_args(model, method, args, kw)
+        )
+
     def get_model(self, model_name: str, check: bool = False) -> "OdooModel":
         """Get a model instance
 
@@ -193,6 +463,13 @@ class OdooClient:
                 raise OdooServerError('Model %s not found' % model)
         return model
 
+    def invalidate_metadata(self, model: Optional[str] = None):
+        """Invalidate the fields of a model (or all models) in the registry
+
+        :param model: The model name (default: all models of the database)
+        """
+        self.metadata_registry.invalidate(self.url, self.database, model)
+
     def list_databases(self) -> List[str]:
         """Get the list of databases (may be disabled on the server and fail)"""
         return self._call("db", "list")
@@ -307,7 +584,6 @@ class OdooModel:
         """
         self.odoo = odoo
         self.model = model
-        self._field_info = None
 
     def __getattr__(self, name: str):
         """By default, return function bound to execute(name, ...)"""
@@ -327,181 +603,148 @@ class OdooModel:
             **kw,
         )
 
+    def execute_iter(self, method: str, *args, **kw) -> Iterator:
+        """Execute an rpc method with arguments and iterate over the result"""
+        logging.getLogger(__name__).debug("Execute %s on %s (iter)", method, self.model)
+        return self.odoo._execute_kw_iter(
+            self.model,
+            method,
+            *args,
+            **kw,
+        )
+
     def __repr__(self) -> str:
         return repr(self.odoo) + "/" + self.model
 
     def fields(self, extended=False) -> Dict[str, dict]:
-        """Return the fields of the model"""
-        if not self._field_info or (extended and not self._field_info['id'].get('name')):
-            attributes = (
-                [] if extended else ['string', 'type', 'readonly', 'required', 'store', 'relation']
-            )
-            self._field_info = self.execute(
-                'fields_get',
-                allfields=[],
-                attributes=attributes,
-            )
-        return self._field_info  # type: ignore
-
-    def __prepare_dict_fields(self, fields: Union[List[str], Dict[str, Dict]]) -> Dict[str, Dict]:
-        """Make sure fields is a dict representing the data to get"""
-        if isinstance(fields, list):
-            new_fields: Dict[str, Dict] = {}
-            for field in fields:
-                level = new_fields
-                for f in field.split('.'):
-                    if f not in level:
-                        level[f] = {}
-                    level = level[f]
-            return new_fields
-        if isinstance(fields, dict):
-            new_fields = {}
-            for k, v in fields.items():
-                if isinstance(v, set):
-                    v = list(v)
-                if isinstance(v, list):
-                    new_fields[k] = self.__prepare_dict_fields(v)
-            if new_fields:
-                new_fields.update({k: v for k, v in fields.items() if k not in new_fields})
-                return new_fields
-            return fields
-        raise ValueError('Invalid fields parameter: %s' % fields)
-
-    def __read_dict_date(self, data, fields):
-        """Transform dates into ISO-like format"""
-        for field in fields:
-            mapper = None
-            if field.endswith(':quarter'):
-                regex = re.compile(r'Q(\d) (\d+)')
-
-                def mapper(v, range):
-                    m = v and regex.match(v)
-                    return "%s-Q%d" % (m.group(2), int(m.group(1))) if m else v
-
-            elif field.endswith(':month'):
-                regex = re.compile(r'(\w+) (\d+)')
-
-                def mapper(v, range):
-                    m = v and regex.match(v)
-                    return "%s-%02d" % (m.group(2), get_month(m.group(1))) if m else v
-
-            elif field.endswith(':week'):
-                regex = re.compile(r'W(\w+) (\d+)')
-
-                def mapper(v, range):
-                    m = v and regex.match(v)
-                    return "%s-W%02d" % (m.group(2), int(m.group(1))) if m else v
-
-            elif field.endswith(':day'):
-                regex = re.compile(r'(\d+) (\w+) (\d+)')
-
-                def mapper(v, range):
-                    m = v and regex.match(v)
-                    return (
-                        "%s-%02d-%02d" % (m.group(3), get_month(m.group(2)), int(m.group(1)))
-                        if m
-                        else v
-                    )
-
-            elif field.endswith(':hour'):
-                regex = re.compile(r'(\d+):00 (\d+) (\w+)')
-
-                def mapper(v, range):
-                    if not v:
-                        return v
-                    date = range.get('from')
-                    return date if date else v
-
-            if mapper:
-                raw_field = field.split(':', 1)[0]
-                has_range = self.odoo.major_version >= 15
-                for d in data:
-                    if has_range:
-                        d_range = d['__range'].get(raw_field)
-                    else:
-                        # parse the domain to get the range
-                        d_range = {}
-                        for e in d['__domain']:
-                            if isinstance(e, list) and len(e) == 3 and e[0] == raw_field:
-                                if e[1] == ">=" and 'from' not in d_range:
-                                    d_range['from'] = e[2]
-                                elif e[1] == "<" and 'to' not in d_range:
-                                    d_range['to'] = e[2]
-                    d[field] = mapper(d[field], d_range)
-        return data
+        """Return the fields of the model
+
+        The fields are kept in the metadata registry of the client,
+        shared with other clients connected to the same database.
+        """
+        registry = self.odoo.metadata_registry
+        field_info = registry.get(self.odoo, self.model, extended)
+        if field_info is None:
+            cache = self.odoo.metadata_cache
+            field_info = cache.get(self.odoo, self.model, extended) if cache else None
+            if field_info is None:
+                attributes = (
+                    []
+                    if extended
+                    else ['string', 'type', 'readonly', 'required', 'store', 'relation']
+                )
+                field_info = self.execute(
+                    'fields_get',
+                    allfields=[],
+                    attributes=attributes,
+                )
+                if cache:
+                    cache.set(self.odoo, self.model, field_info, extended)
+            registry.set(self.odoo, self.model, field_info, extended)
+        return field_info
 
     def __read_dict_recursive(self, data, fields):
-        """For each field, read recursively the data"""
+        """For each field, read recursively the data
+
+        The relations are resolved level by level, reads of a level are merged
+        into a single read per model which are executed concurrently
+        (see `OdooClient.max_workers`).
+        """
         if not fields:
             fields = {f: {} for f in self.fields()}
-        for field_name, child_fields in fields.items():
-            field_info = self.fields().get(field_name, {})
-            model_name = field_info.get('relation')
-            if not model_name:
-                # not a relation field, skip it
-                continue
-
-            # simplify contents and get ids
-            many = field_info.get('type') != 'many2one'
-            ids = set()
-            if many:
-                for datum in data:
-                    value = datum.get(field_name)
-                    if isinstance(value, list):
-                        ids.update(value)
-                    else:
-                        datum[field_name] = []
-            else:
-                for datum in data:
-                    value = datum.get(field_name)
-                    if isinstance(value, int) and value:
-                        ids.add(value)
-                    elif isinstance(value, list):
-                        assert len(value) == 2 and not isinstance(value[1], int)
-                        datum[field_name] = value[0]
-                        ids.add(value[0])
-            if not ids or not (set(child_fields) - {'id'}):
-                continue
-
-            # read the data from children
-            model = self.odoo.get_model(model_name)
-            children_data = model._read(list(ids), list(child_fields))
-            model.__read_dict_recursive(children_data, child_fields)
-            children_data = {e['id']: e for e in children_data}
-
-            # replace the data
-            if many:
-                for datum in data:
-                    datum[field_name] = [
-                        children_data.get(v) or {"id": v} for v in datum.get(field_name) or []
-                    ]
-            else:
-                for datum in data:
-                    v = datum.get(field_name)
-                    datum[field_name] = (children_data.get(v) or {"id": v}) if v else {}
-
+        level = [(self.model, data, fields)]
+        while level:
+            models_fields = {m: self.odoo.get_model(m).fields() for m, _d, _f in level}
+            reads, branches = _read_dict_plan(level, models_fields)
+            jobs = [
+                (m, chunk, list(fs))
+                for m, (ids, fs) in reads.items()
+                for chunk in _chunks(list(ids), self.odoo.read_chunk_size)
+            ]
+            results = {m: [] for m in reads}
+            for job, result in zip(
+                jobs,
+                parallel_map(
+                    lambda job: self.odoo.get_model(job[0])._read(job[1], job[2]),
+                    jobs,
+                    self.odoo.max_workers,
+                ),
+            ):
+                results[job[0]] += result
+            level = _read_dict_distribute(branches, results)
         return data
 
     def _read(self, ids: List[int], fields: List[str], **kwargs):
-        """Raw read() function"""
-        return self.read(ids, fields, load='raw', **kwargs)
+        """Raw read() function
+
+        Ids are read by chunks (see `OdooClient.read_chunk_size`), executed concurrently.
+        """
+        chunks = _chunks(ids, self.odoo.read_chunk_size)
+        if len(chunks) == 1:
+            return self.read(ids, fields, load='raw', **kwargs)
+        results = parallel_map(
+            lambda chunk: self.read(chunk, fields, load='raw', **kwargs),
+            chunks,
+            self.odoo.max_workers,
+        )
+        return [d for result in results for d in result]
 
     def _search_read(self, domain: List, fields: List[str], **kwargs):
         """Raw search_read() function"""
         if self.odoo.major_version >= 15:
             return self.search_read(domain, fields, load='raw', **kwargs)
         # before v15, load argument is not supported
-        data = self.search_read(domain, fields, **kwargs)
-        for d in data:
-            for k, v in d.items():
-                if (
-                    isinstance(v, list)
-                    and len(v) == 2
-                    and isinstance(v[0], int)
-                    and isinstance(v[1], str)
-                ):
-                    d[k] = v[0]
-        return data
+        return _raw_values(self.search_read(domain, fields, **kwargs))
+
+    def search_read_iter(
+        self, domain: List, fields: List[str], *, page_size: int = 0, **kwargs
+    ) -> Iterator[Dict]:
+        """Search read and iterate over the records as they are received
+
+        When page_size is set, the records are read by pages ordered by id,
+        each page is searched with `id > last_id` so that reading a page
+        has a constant cost (unlike using an offset).
+
+        :param domain: The domain for the search
+        :param fields: The fields to read
+        :param page_size: Number of records to read per call (default: all at once)
+        :param kwargs: Other arguments passed to search_read (limit, offet, orderby, etc.)
+        :return: An iterator of records
+        """
+        if not page_size:
+            return self.execute_iter('search_read', domain, fields, **kwargs)
+        if kwargs.get('order') or kwargs.get('offset'):
+            raise ValueError('Cannot use order or offset when reading by pages')
+        kwargs.pop('order', None)
+        kwargs.pop('offset', None)
+        return self.__search_read_pages(domain, fields, page_size, **kwargs)
+
+    def __search_read_pages(
+        self, domain: List, fields: List[str], page_size: int, *, limit: int = 0, **kwargs
+    ) -> Iterator[Dict]:
+        """Read pages of records using the id as a key"""
+        last_id = 0
+        count = 0
+        while True:
+            size = min(page_size, limit - count) if limit else page_size
+            page_domain = [('id', '>', last_id)] + list(domain)
+            page_count = 0
+            for record in self.execute_iter(
+                'search_read', page_domain, fields, order='id', limit=size, **kwargs
+            ):
+                last_id = record['id']
+                page_count += 1
+                yield record
+            count += page_count
+            if page_count < size or (limit and count >= limit):
+                break
+
+    def _search_read_iter(self, domain: List, fields: List[str], **kwargs) -> Iterator[Dict]:
+        """Raw search_read_iter() function"""
+        if self.odoo.major_version >= 15:
+            return self.search_read_iter(domain, fields, load='raw', **kwargs)
+        # before v15, load argument is not supported
+        return (_raw_values([d])[0] for d in self.search_read_iter(domain, fields, **kwargs))
 
     def read_dict(
         self,
@@ -522,7 +765,7 @@ class OdooModel:
         if isinstance(ids, int):
             ids = [ids]
             single = True
-        fields = self.__prepare_dict_fields(fields)
+        fields = _prepare_dict_fields(fields)
         data = self._read(ids, list(fields))
         result = self.__read_dict_recursive(data, fields)
         return result[0] if single else result
@@ -538,10 +781,40 @@ class OdooModel:
         :param kwargs: Other arguments passed to search_read (limit, offet, orderby, etc.)
         :return: A list of found objects
         """
-        fields = self.__prepare_dict_fields(fields)
+        fields = _prepare_dict_fields(fields)
         data = self._search_read(domain, list(fields), **kwargs)
         return self.__read_dict_recursive(data, fields)
 
+    def search_read_dict_iter(
+        self,
+        domain: List,
+        fields: Union[List[str], Dict[str, Dict]],
+        *,
+        batch_size: int = 1000,
+        **kwargs,
+    ) -> Iterator[Dict]:
+        """Search read with a dictionnary output and iterate over the records
+
+        Similar to `search_read_dict`, but the records are read as they are
+        received and the related records are read by batches.
+
+        :param domain: The domain for the search
+        :param fields: A list of fields (may contain chains f1.f2)
+                       or a dict containing fields to read {field: {child_fields...}}
+        :param batch_size: Number of records for which relations are read at once
+        :param kwargs: Other arguments passed to search_read_iter (page_size, limit, etc.)
+        :return: An iterator of records
+        """
+        fields = _prepare_dict_fields(fields)
+        batch = []
+        for record in self._search_read_iter(domain, list(fields), **kwargs):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield from self.__read_dict_recursive(batch, fields)
+                batch = []
+        if batch:
+            yield from self.__read_dict_recursive(batch, fields)
+
     def read_group_dict(
         self, domain: List, aggregates: Optional[List], groupby: List[str], **kwargs
     ):
@@ -552,11 +825,302 @@ class OdooModel:
         :param groupby: Fields to group by
         :return: A list of groupped data
         """
-        groupby_parsed = self.__prepare_dict_fields(groupby)
+        groupby_parsed = _prepare_dict_fields(groupby)
         groupby_list = list(groupby_parsed)
         if not groupby_list:
             raise ValueError('Missing groupby values')
         kwargs['lazy'] = False
         data = self.read_group(domain, aggregates or ['id'], groupby_list, **kwargs)
-        data = self.__read_dict_date(data, groupby_list)
+        data = _read_dict_date(data, groupby_list, self.odoo.major_version)
         return self.__read_dict_recursive(data, groupby_parsed)
+
+    def read_frame(self, domain: List, fields: List[str], *, page_size: int = 10000, **kwargs):
+        """Search read into a pandas DataFrame
+
+        The records are read by pages and the values are added to columns
+        typed using the field types: integers, floats, booleans, dates and datetimes
+        (datetime64), selections (categorical). A many2one field is split into
+        an id column (with the field name) and a `field.name` column.
+        Requires pandas and numpy.
+
+        :param domain: The domain for the search
+        :param fields: The fields to read (without relation paths)
+        :param page_size: Number of records to read per call (default: 10000)
+        :param kwargs: Other arguments passed to search_read_iter (limit, etc.)
+        :return: A DataFrame
+        """
+        import pandas as pd
+
+        if any('.' in f for f in fields):
+            raise ValueError('Relation paths are not supported by read_frame')
+        field_info = self.fields()
+        columns: Dict[str, List] = {f: [] for f in fields}
+        for record in self.search_read_iter(domain, fields, page_size=page_size, **kwargs):
+            for f, values in columns.items():
+                values.append(record.get(f))
+        frame = {}
+        for f, values in columns.items():
+            field_type = 'integer' if f == 'id' else field_info.get(f, {}).get('type')
+            if field_type == 'many2one':
+                ids = [v[0] if isinstance(v, list) else v for v in values]
+                frame[f] = _frame_column(ids, 'integer')
+                frame[f + '.name'] = _frame_column(
+                    [v[1] if isinstance(v, list) else None for v in values], 'char'
+                )
+            else:
+                frame[f] = _frame_column(values, field_type)
+        return pd.DataFrame(frame)
+
+
+def _frame_column(values: List, field_type: Optional[str]):
+    """Convert Odoo values to a typed column (False is null except for booleans)"""
+    import numpy as np
+    import pandas as pd
+
+    if field_type == 'boolean':
+        return np.array(values, dtype=np.bool_)
+    values = [None if v is False else v for v in values]
+    if field_type == 'integer':
+        if None in values:
+            return pd.array(values, dtype='Int64')
+        return np.array(values, dtype=np.int64)
+    if field_type in ('float', 'monetary'):
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    if field_type == 'date':
+        return np.array([v or 'NaT' for v in values], dtype='datetime64[D]')
+    if field_type == 'datetime':
+        return np.array([v or 'NaT' for v in values], dtype='datetime64[s]')
+    if field_type == 'selection':
+        return pd.Categorical(values)
+    # assign one by one, lists of values must not become another dimension
+    column = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        column[i] = value
+    return column
+
+
+def _iter_json_rpc_result(stream) -> Iterator:
+    """Parse incrementally a jsonrpc reply and yield the items of the result"""
+    item = None
+    error = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if prefix.startswith('result.item'):
+            if item is None:
+                item = ijson.ObjectBuilder()
+            item.event(event, value)
+            if prefix == 'result.item' and event not in ('start_map', 'start_array', 'map_key'):
+                yield item.value
+                item = None
+        elif prefix == 'error' or prefix.startswith('error.'):
+            if error is None:
+                error = ijson.ObjectBuilder()
+            error.event(event, value)
+    if error is not None and error.value:
+        raise OdooServerError(error.value)
+
+
+def _prepare_dict_fields(fields: Union[List[str], Dict[str, Dict]]) -> Dict[str, Dict]:
+    """Make sure fields is a dict representing the data to get"""
+    if isinstance(fields, list):
+        new_fields: Dict[str, Dict] = {}
+        for field in fields:
+            level = new_fields
+            for f in field.split('.'):
+                if f not in level:
+                    level[f] = {}
+                level = level[f]
+        return new_fields
+    if isinstance(fields, dict):
+        new_fields = {}
+        for k, v in fields.items():
+            if isinstance(v, set):
+                v = list(v)
+            if isinstance(v, list):
+                new_fields[k] = _prepare_dict_fields(v)
+        if new_fields:
+            new_fields.update({k: v for k, v in fields.items() if k not in new_fields})
+            return new_fields
+        return fields
+    raise ValueError('Invalid fields parameter: %s' % fields)
+
+
+def _raw_values(data: List[Dict]) -> List[Dict]:
+    """Transform many2one values (id, name) into id, like load='raw' does"""
+    for d in data:
+        for k, v in d.items():
+            if (
+                isinstance(v, list)
+                and len(v) == 2
+                and isinstance(v[0], int)
+                and isinstance(v[1], str)
+            ):
+                d[k] = v[0]
+    return data
+
+
+def _read_dict_date(data, fields, major_version):
+    """Transform dates into ISO-like format"""
+    for field in fields:
+        mapper = None
+        if field.endswith(':quarter'):
+            regex = re.compile(r'Q(\d) (\d+)')
+
+            def mapper(v, range):
+                m = v and regex.match(v)
+                return "%s-Q%d" % (m.group(2), int(m.group(1))) if m else v
+
+        elif field.endswith(':month'):
+            regex = re.compile(r'(\w+) (\d+)')
+
+            def mapper(v, range):
+                m = v and regex.match(v)
+                return "%s-%02d" % (m.group(2), get_month(m.group(1))) if m else v
+
+        elif field.endswith(':week'):
+            regex = re.compile(r'W(\w+) (\d+)')
+
+            def mapper(v, range):
+                m = v and regex.match(v)
+                return "%s-W%02d" % (m.group(2), int(m.group(1))) if m else v
+
+        elif field.endswith(':day'):
+            regex = re.compile(r'(\d+) (\w+) (\d+)')
+
+            def mapper(v, range):
+                m = v and regex.match(v)
+                return (
+                    "%s-%02d-%02d" % (m.group(3), get_month(m.group(2)), int(m.group(1)))
+                    if m
+                    else v
+                )
+
+        elif field.endswith(':hour'):
+            regex = re.compile(r'(\d+):00 (\d+) (\w+)')
+
+            def mapper(v, range):
+                if not v:
+                    return v
+                date = range.get('from')
+                return date if date else v
+
+        if mapper:
+            raw_field = field.split(':', 1)[0]
+            has_range = major_version >= 15
+            for d in data:
+                if has_range:
+                    d_range = d['__range'].get(raw_field)
+                else:
+                    # parse the domain to get the range
+                    d_range = {}
+                    for e in d['__domain']:
+                        if isinstance(e, list) and len(e) == 3 and e[0] == raw_field:
+                            if e[1] == ">=" and 'from' not in d_range:
+                                d_range['from'] = e[2]
+                            elif e[1] == "<" and 'to' not in d_range:
+                                d_range['to'] = e[2]
+                d[field] = mapper(d[field], d_range)
+    return data
+
+
+def _read_dict_relation_ids(
+    data: List[Dict], field_name: str, field_info: Dict
+) -> Tuple[bool, Set[int]]:
+    """Simplify the relation values in data and get the related ids
+
+    :return: A tuple (many, ids) where many indicates an x2many field
+    """
+    many = field_info.get('type') != 'many2one'
+    ids: Set[int] = set()
+    if many:
+        for datum in data:
+            value = datum.get(field_name)
+            if isinstance(value, list):
+                ids.update(value)
+            else:
+                datum[field_name] = []
+    else:
+        for datum in data:
+            value = datum.get(field_name)
+            if isinstance(value, int) and value:
+                ids.add(value)
+            elif isinstance(value, list):
+                assert len(value) == 2 and not isinstance(value[1], int)
+                datum[field_name] = value[0]
+                ids.add(value[0])
+    return many, ids
+
+
+def _read_dict_plan(
+    level: List[Tuple[str, List[Dict], Dict[str, Dict]]], models_fields: Dict[str, Dict]
+) -> Tuple[Dict[str, Tuple[Dict[int, None], Dict[str, None]]], List[Tuple]]:
+    """Collect the reads needed to resolve a level of read_dict
+
+    The reads of all branches are merged by model, so that each
+    model is read once per level.
+
+    :param level: List of (model name, data, fields) to resolve
+    :param models_fields: The fields information of the models in the level
+    :return: A tuple (reads, branches) where reads maps model names to the
+             ids and fields to read (as ordered dicts) and branches are the
+             relations to replace
+    """
+    reads: Dict[str, Tuple[Dict[int, None], Dict[str, None]]] = {}
+    branches = []
+    for model_name, data, fields in level:
+        for field_name, child_fields in fields.items():
+            field_info = models_fields[model_name].get(field_name, {})
+            relation = field_info.get('relation')
+            if not relation:
+                # not a relation field, skip it
+                continue
+
+            # simplify contents and get ids
+            many, ids = _read_dict_relation_ids(data, field_name, field_info)
+            if not ids or not (set(child_fields) - {'id'}):
+                continue
+            read_ids, read_fields = reads.setdefault(relation, ({}, {}))
+            read_ids.update(dict.fromkeys(ids))
+            read_fields.update(dict.fromkeys(child_fields))
+            branches.append((data, field_name, many, relation, ids, child_fields))
+    return reads, branches
+
+
+def _read_dict_distribute(
+    branches: List[Tuple], results: Dict[str, List[Dict]]
+) -> List[Tuple[str, List[Dict], Dict[str, Dict]]]:
+    """Replace the relations with the read data and return the next level to resolve
+
+    When a model is read for multiple branches, each branch gets its own
+    copy of the records with only the requested fields.
+    """
+    indexes = {model_name: {d['id']: d for d in data} for model_name, data in results.items()}
+    branch_count: Dict[str, int] = {}
+    for branch in branches:
+        branch_count[branch[3]] = branch_count.get(branch[3], 0) + 1
+    next_level = []
+    for data, field_name, many, model_name, ids, child_fields in branches:
+        index = indexes[model_name]
+        if branch_count[model_name] > 1:
+            keys = {'id', *child_fields}
+            children_data = [
+                {k: v for k, v in index[i].items() if k in keys} for i in ids if i in index
+            ]
+        else:
+            children_data = [index[i] for i in ids if i in index]
+        _read_dict_replace(data, field_name, many, children_data)
+        next_level.append((model_name, children_data, child_fields))
+    return next_level
+
+
+def _read_dict_replace(data: List[Dict], field_name: str, many: bool, children_data: List[Dict]):
+    """Replace the relation ids in data with the read children"""
+    children_index = {e['id']: e for e in children_data}
+    if many:
+        for datum in data:
+            datum[field_name] = [
+                children_index.get(v) or {"id": v} for v in datum.get(field_name) or []
+            ]
+    else:
+        for datum in data:
+            v = datum.get(field_name)
+            datum[field_name] = (children_index.get(v) or {"id": v}) if v else {}
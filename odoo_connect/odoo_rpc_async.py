@@ -0,0 +1,399 @@
+import asyncio
+import logging
+import random
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+from .metadata import METADATA_REGISTRY, MetadataRegistry
+from .odoo_rpc import (
+    JsonCodec,
+    OdooServerError,
+    Transport,
+    _chunks,
+    _prepare_dict_fields,
+    _raw_values,
+    _read_dict_date,
+    _read_dict_distribute,
+    _read_dict_plan,
+    get_codec,
+    urljoin,
+)
+
+try:
+    import httpx
+
+    HTTP_ERRORS: Tuple[Type[BaseException], ...] = (httpx.HTTPError,)
+except ImportError:
+    httpx = None  # type: ignore
+    HTTP_ERRORS = ()
+
+__doc__ = """Asynchronous RPC class for Odoo
+
+The asynchronous client mirrors the basic API of `OdooClient`,
+each RPC call is a coroutine so that calls can be executed concurrently
+with `asyncio.gather`. It requires `httpx` to be installed.
+"""
+
+
+class AsyncOdooClient:
+    """Odoo server connection using asyncio"""
+
+    url: str
+    transport: Transport
+    codec: JsonCodec
+    read_chunk_size: int
+    metadata_registry: MetadataRegistry
+    _models: Dict[str, "AsyncOdooModel"]
+    _version: Dict[str, Any]
+    _database: str
+    _username: str
+    _password: str
+    _uid: Optional[int]
+    context: Dict
+
+    def __init__(
+        self,
+        url: str,
+        database: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        codec: Optional[JsonCodec] = None,
+        metadata_registry: Optional[MetadataRegistry] = None,
+    ):
+        """Create new connection."""
+        self.url = url
+        self.transport = transport or Transport()
+        self.codec = codec or get_codec()
+        self.metadata_registry = metadata_registry or METADATA_REGISTRY
+        # maximum number of records read by a single call (0 for no limit)
+        self.read_chunk_size = 5000
+        self.context = {}
+        self._database = database or ''
+        self._models = {}
+        self._version = {}
+        self._username = ''
+        self._password = ''
+        self._uid = None
+        self._init_session()
+        logging.getLogger(__name__).info(
+            "Odoo initialized %s, db: [%s]",
+            self.url,
+            self.database,
+        )
+
+    def _init_session(self):
+        """Initialize the session"""
+        if httpx is None and not self.transport.async_session_factory:
+            raise ImportError('httpx is required for the asynchronous client')
+        self.__json_url = urljoin(self.url, "jsonrpc")
+        self.session = self.transport.create_async_session()
+
+    async def close(self):
+        """Close the session"""
+        await self.session.aclose()
+
+    async def __aenter__(self) -> "AsyncOdooClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _find_default_database(self, *, monodb=True) -> str:
+        """Find the default database from the server or raise an exception"""
+        log = logging.getLogger(__name__)
+        log.debug("Lookup the default database for [%s]", self.url)
+        # Get from monodb
+        try:
+            db = await self._call("db", "monodb") if monodb else None
+            if isinstance(db, str) and db:
+                return db
+        except OdooServerError as e:
+            log.debug('db.monodb call failed: %s', e)
+        # Try to list databases
+        try:
+            dbs = await self.list_databases()
+            if len(dbs) == 1:
+                return dbs[0]
+        except OdooServerError as e:
+            log.debug('db.list call failed: %s', e)
+        # Fail or default
+        if self.database:
+            return self.database
+        raise OdooServerError('Cannot determine the database for [%s]' % self.url)
+
+    async def authenticate(self, username: str, password: str):
+        """Authenticate with username and password"""
+        log = logging.getLogger(__name__)
+        old_username = self._username
+        self._uid = None
+        self._username = username
+        self._password = password
+        if not username:
+            if old_username:
+                log.info('Logged out [%s]' % self.url)
+            return
+        if not self._database:
+            raise OdooServerError('Missing database to connect')
+        user_agent_env = {}  # type: ignore
+        self._uid = await self._call(
+            "common",
+            "authenticate",
+            self._database,
+            self._username,
+            self._password,
+            user_agent_env,
+        )
+        if not self._uid:
+            raise OdooServerError('Failed to authenticate user %s' % username)
+        log.info("Login successful [%s], [%s] uid: %d", self.url, self.username, self._uid)
+
+    async def _json_rpc(self, method: str, params: Any):
+        """Make a jsonrpc call"""
+        data = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params,
+            "id": random.randint(0, 1000000000),
+        }
+        resp = await self.session.post(
+            self.__json_url,
+            content=self.codec.dumps(data),
+            headers={'Content-Type': 'application/json'},
+        )
+        resp.raise_for_status()
+        reply = self.codec.loads(resp.content)
+        if reply.get("error"):
+            raise OdooServerError(reply["error"])
+        return reply.get("result", None)
+
+    async def _call(self, service: str, method: str, *args):
+        return await self._json_rpc("call", {"service": service, "method": method, "args": args})
+
+    async def _execute_kw(self, model: str, method: str, *args, **kw):
+        """Execute a method on a model"""
+        if not self._uid:
+            raise RuntimeError('You must authenticate first')
+        if self.context and 'context' not in kw:
+            kw['context'] = self.context
+        return await self._call(
+            "object",
+            "execute_kw",
+            self._database,
+            self._uid,
+            self._password,
+            model,
+            method,
+            args,
+            kw,
+        )
+
+    def get_model(self, model_name: str) -> "AsyncOdooModel":
+        """Get a model instance
+
+        :param model: Name of the model
+        :return: Proxy for the model functions
+        """
+        model = self._models.get(model_name)
+        if model is None:
+            model = AsyncOdooModel(self, model_name)
+            self._models[model_name] = model
+        return model
+
+    def invalidate_metadata(self, model: Optional[str] = None):
+        """Invalidate the fields of a model (or all models) in the registry"""
+        self.metadata_registry.invalidate(self.url, self.database, model)
+
+    async def list_databases(self) -> List[str]:
+        """Get the list of databases (may be disabled on the server and fail)"""
+        return await self._call("db", "list")
+
+    async def version(self) -> dict:
+        """Get the version information from the server"""
+        if self._version:
+            return self._version
+        self._version = await self._call(
+            "common",
+            "version",
+        )
+        return self._version
+
+    async def major_version(self) -> int:
+        return (await self.version())['server_version_info'][0]
+
+    @property
+    def protocol(self) -> str:
+        """Get protocol used"""
+        return "jsonrpc"
+
+    def is_connected(self) -> bool:
+        """Check if the authentication is done"""
+        return self._uid is not None
+
+    @property
+    def username(self) -> str:
+        """Get username"""
+        return self._username
+
+    @property
+    def database(self) -> str:
+        """Get database name"""
+        return self._database
+
+    @database.setter
+    def database(self, database: str):
+        if database is None:
+            raise ValueError('Cannot set database: None')
+        # log out first
+        self._uid = None
+        self._username = ''
+        self._password = ''
+        self._database = database
+        logging.getLogger(__name__).info(
+            "Odoo %s, db: [%s]",
+            self.url,
+            self.database,
+        )
+
+    def __getitem__(self, model: str) -> "AsyncOdooModel":
+        """Alias for get_model"""
+        return self.get_model(model)
+
+    def __repr__(self) -> str:
+        user = str(self._uid or self._username)
+        return f"AsyncOdooClient({self.url},{self.protocol},db:{self.database},user:{user})"
+
+
+class AsyncOdooModel:
+    """Odoo model (object) RPC functions using asyncio"""
+
+    def __init__(self, odoo: AsyncOdooClient, model: str):
+        """Initialize the model instance.
+
+        :param odoo: Odoo instance
+        :param model: Name of the model
+        """
+        self.odoo = odoo
+        self.model = model
+
+    def __getattr__(self, name: str):
+        """By default, return coroutine function bound to execute(name, ...)"""
+
+        async def odoo_wrapper(*args, **kw):
+            return await self.execute(name, *args, **kw)
+
+        return odoo_wrapper
+
+    async def execute(self, method: str, *args, **kw):
+        """Execute an rpc method with arguments"""
+        logging.getLogger(__name__).debug("Execute %s on %s", method, self.model)
+        return await self.odoo._execute_kw(
+            self.model,
+            method,
+            *args,
+            **kw,
+        )
+
+    def __repr__(self) -> str:
+        return repr(self.odoo) + "/" + self.model
+
+    async def fields(self, extended=False) -> Dict[str, dict]:
+        """Return the fields of the model (see `OdooModel.fields`)"""
+        registry = self.odoo.metadata_registry
+        field_info = registry.get(self.odoo, self.model, extended)
+        if field_info is None:
+            attributes = (
+                [] if extended else ['string', 'type', 'readonly', 'required', 'store', 'relation']
+            )
+            field_info = await self.execute(
+                'fields_get',
+                allfields=[],
+                attributes=attributes,
+            )
+            registry.set(self.odoo, self.model, field_info, extended)
+        return field_info
+
+    async def _read_dict_recursive(self, data, fields):
+        """For each field, read recursively the data (see `OdooModel.read_dict`)"""
+        if not fields:
+            fields = {f: {} for f in await self.fields()}
+        level = [(self.model, data, fields)]
+        while level:
+            model_names = list({m for m, _d, _f in level})
+            models_fields = dict(
+                zip(
+                    model_names,
+                    await asyncio.gather(*(self.odoo.get_model(m).fields() for m in model_names)),
+                )
+            )
+            reads, branches = _read_dict_plan(level, models_fields)
+            results = await asyncio.gather(
+                *(
+                    self.odoo.get_model(m)._read(list(ids), list(fs))
+                    for m, (ids, fs) in reads.items()
+                )
+            )
+            level = _read_dict_distribute(branches, dict(zip(reads, results)))
+        return data
+
+    async def _read(self, ids: List[int], fields: List[str], **kwargs):
+        """Raw read() function
+
+        Ids are read by chunks (see `AsyncOdooClient.read_chunk_size`), executed concurrently.
+        """
+        results = await asyncio.gather(
+            *(
+                self.read(chunk, fields, load='raw', **kwargs)
+                for chunk in _chunks(ids, self.odoo.read_chunk_size)
+            )
+        )
+        return [d for result in results for d in result]
+
+    async def _search_read(self, domain: List, fields: List[str], **kwargs):
+        """Raw search_read() function"""
+        if await self.odoo.major_version() >= 15:
+            return await self.search_read(domain, fields, load='raw', **kwargs)
+        # before v15, load argument is not supported
+        return _raw_values(await self.search_read(domain, fields, **kwargs))
+
+    async def read_dict(
+        self,
+        ids: Union[List[int], int],
+        fields: Union[List[str], Dict[str, Dict]],
+    ):
+        """Read with a dictionnary output and hierarchy view
+
+        See `OdooModel.read_dict`.
+        """
+        single = False
+        if isinstance(ids, int):
+            ids = [ids]
+            single = True
+        fields = _prepare_dict_fields(fields)
+        data = await self._read(ids, list(fields))
+        result = await self._read_dict_recursive(data, fields)
+        return result[0] if single else result
+
+    async def search_read_dict(
+        self, domain: List, fields: Union[List[str], Dict[str, Dict]], **kwargs
+    ):
+        """Search read with a dictionnary output and hierarchy view
+
+        See `OdooModel.search_read_dict`.
+        """
+        fields = _prepare_dict_fields(fields)
+        data = await self._search_read(domain, list(fields), **kwargs)
+        return await self._read_dict_recursive(data, fields)
+
+    async def read_group_dict(
+        self, domain: List, aggregates: Optional[List], groupby: List[str], **kwargs
+    ):
+        """Search read groupped data
+
+        See `OdooModel.read_group_dict`.
+        """
+        groupby_parsed = _prepare_dict_fields(groupby)
+        groupby_list = list(groupby_parsed)
+        if not groupby_list:
+            raise ValueError('Missing groupby values')
+        kwargs['lazy'] = False
+        data = await self.read_group(domain, aggregates or ['id'], groupby_list, **kwargs)
+        data = _read_dict_date(data, groupby_list, await self.odoo.major_version())
+        return await self._read_dict_recursive(data, groupby_parsed)
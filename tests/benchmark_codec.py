@@ -0,0 +1,56 @@
+"""Compare the JSON codecs on a large synthetic search_read response
+
+Run with: python -m tests.benchmark_codec [rows]
+"""
+
+import sys
+import timeit
+
+from odoo_connect.odoo_rpc import OrjsonCodec, UjsonCodec, get_codec
+
+
+def make_response(rows: int) -> dict:
+    """Build a reply similar to a search_read on account.move.line"""
+    result = [
+        {
+            'id': i,
+            'name': 'INV/2023/%05d line %d' % (i // 10, i % 10),
+            'move_id': i // 10,
+            'partner_id': i % 500 or False,
+            'account_id': 400 + i % 30,
+            'date': '2023-%02d-%02d' % (i % 12 + 1, i % 28 + 1),
+            'debit': (i % 1000) * 1.25,
+            'credit': 0.0,
+            'balance': (i % 1000) * 1.25,
+            'tax_ids': [1, 2] if i % 3 else [],
+            'reconciled': bool(i % 2),
+            'write_date': '2023-01-01 12:00:00',
+        }
+        for i in range(rows)
+    ]
+    return {'jsonrpc': '2.0', 'id': 1, 'result': result}
+
+
+def main(rows: int = 100000, repeat: int = 5):
+    reply = make_response(rows)
+    codecs = [get_codec('json')]
+    for codec_class in (OrjsonCodec, UjsonCodec):
+        try:
+            codecs.append(codec_class())
+        except ImportError:
+            print('%s: not installed' % codec_class.name)
+    payload = codecs[0].dumps(reply)
+    print('Response of %d rows, %.1f MB' % (rows, len(payload) / 1e6))
+    baseline = None
+    for codec in codecs:
+        t_loads = min(timeit.repeat(lambda: codec.loads(payload), number=1, repeat=repeat))
+        t_dumps = min(timeit.repeat(lambda: codec.dumps(reply), number=1, repeat=repeat))
+        baseline = baseline or t_loads
+        print(
+            '%-8s loads %7.1f ms (x%.1f)  dumps %7.1f ms'
+            % (codec.name, t_loads * 1000, baseline / t_loads, t_dumps * 1000)
+        )
+
+
+if __name__ == '__main__':
+    main(*(int(a) for a in sys.argv[1:2]))
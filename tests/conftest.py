@@ -18,6 +18,10 @@ def connect_params(httpserver, odoo_json_rpc_handler):
 @pytest.fixture(scope='function')
 def odoo_json_rpc_handler(httpserver):
     """Setup the http server for Odoo JSON RPC"""
+    from odoo_connect.metadata import METADATA_REGISTRY
+
+    # the models are redefined by each test
+    METADATA_REGISTRY.invalidate()
     handler = mock_odoo_server.default_rpc_handler()
     httpserver.expect_request(
         "/jsonrpc", headers={'content-type': 'application/json'}
@@ -32,6 +36,131 @@ def odoo_cli(connect_params):
     return odoo_connect.connect(**connect_params)
 
 
+def _many2one(relation):
+    return {'type': 'many2one', 'relation': relation}
+
+
+def _one2many(relation):
+    return {'type': 'one2many', 'relation': relation}
+
+
+@pytest.fixture(scope='function')
+def odoo_orders_data():
+    """In-memory data used by odoo_cli_orders: {model: (fields, {id: record})}"""
+    orders = {
+        i: {
+            'id': i,
+            'name': 'S%03d' % i,
+            'partner_id': i % 3 + 1,
+            'company_id': 1,
+            'order_line': [10 * i + 1, 10 * i + 2],
+        }
+        for i in range(1, 51)
+    }
+    lines = {
+        line_id: {
+            'id': line_id,
+            'name': 'L%d' % line_id,
+            'order_id': order['id'],
+            'order_partner_id': order['partner_id'],
+            'product_id': line_id % 5 + 1,
+        }
+        for order in orders.values()
+        for line_id in order['order_line']
+    }
+    partners = {
+        i: {'id': i, 'name': 'partner %d' % i, 'country_id': 1 if i % 2 else 2} for i in range(1, 5)
+    }
+    return {
+        'sale.order': (
+            {
+                'id': {'type': 'int'},
+                'name': {'type': 'char'},
+                'partner_id': _many2one('res.partner'),
+                'company_id': _many2one('res.company'),
+                'order_line': _one2many('sale.order.line'),
+            },
+            orders,
+        ),
+        'sale.order.line': (
+            {
+                'id': {'type': 'int'},
+                'name': {'type': 'char'},
+                'order_id': _many2one('sale.order'),
+                'order_partner_id': _many2one('res.partner'),
+                'product_id': _many2one('product.product'),
+            },
+            lines,
+        ),
+        'res.partner': (
+            {
+                'id': {'type': 'int'},
+                'name': {'type': 'char'},
+                'country_id': _many2one('res.country'),
+            },
+            partners,
+        ),
+        'res.company': (
+            {
+                'id': {'type': 'int'},
+                'name': {'type': 'char'},
+                'partner_id': _many2one('res.partner'),
+            },
+            {1: {'id': 1, 'name': 'company', 'partner_id': 4}},
+        ),
+        'res.country': (
+            {'id': {'type': 'int'}, 'name': {'type': 'char'}},
+            {1: {'id': 1, 'name': 'Belgium'}, 2: {'id': 2, 'name': 'Poland'}},
+        ),
+        'product.product': (
+            {'id': {'type': 'int'}, 'name': {'type': 'char'}},
+            {i: {'id': i, 'name': 'product %d' % i} for i in range(1, 6)},
+        ),
+    }
+
+
+@pytest.fixture(scope='function')
+def odoo_cli_orders(odoo_cli, odoo_json_rpc_handler, odoo_orders_data):
+    """Client with sale orders and related models, read calls are logged in handler.read_calls"""
+    handler = odoo_json_rpc_handler
+    handler.read_calls = []
+
+    def select(record, fields):
+        return {k: v for k, v in record.items() if not fields or k in ['id'] + fields}
+
+    def search(records, domain, order=None, limit=None):
+        data = list(records.values())
+        for left, op, right in domain:
+            assert left == 'id' and op == '>'
+            data = [d for d in data if d['id'] > right]
+        if order:
+            assert order == 'id'
+        return data[:limit] if limit else data
+
+    def patch_model(model, field_info, records):
+        @handler.patch_execute_kw(model, 'fields_get')
+        def fields_get(allfields=[], attributes=[]):
+            return field_info
+
+        @handler.patch_execute_kw(model, 'read')
+        def read(ids, fields=[], load=None):
+            handler.read_calls.append((model, list(ids), list(fields)))
+            return [select(records[i], fields) for i in ids if i in records]
+
+        @handler.patch_execute_kw(model, 'search_read')
+        def search_read(domain, fields=[], load=None, order=None, limit=None):
+            data = search(records, domain, order=order, limit=limit)
+            return [select(d, fields) for d in data]
+
+        @handler.patch_execute_kw(model, 'search')
+        def search_ids(domain, order=None, limit=None):
+            return [d['id'] for d in search(records, domain, order=order, limit=limit)]
+
+    for model, (field_info, records) in odoo_orders_data.items():
+        patch_model(model, field_info, records)
+    return odoo_cli
+
+
 # CONFIGURE PYTEST
 
 
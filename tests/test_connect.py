@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 import odoo_connect
@@ -39,3 +41,239 @@ def test_model_read(odoo_cli):
     assert users and isinstance(odoo_cli['res.users'], type(users))
     data = users.read(1)
     assert isinstance(data, list) and len(data)
+
+
+def test_transport(connect_params):
+    import requests
+
+    sessions = []
+
+    def session_factory():
+        session = requests.Session()
+        sessions.append(session)
+        return session
+
+    transport = odoo_connect.Transport(session_factory=session_factory, timeout=5)
+    env = odoo_connect.connect(**connect_params, transport=transport)
+    assert env.transport is transport
+    assert env.session is sessions[0]
+    assert env.user
+
+
+def test_transport_pool_size():
+    transport = odoo_connect.Transport(pool_maxsize=32, keep_alive=False)
+    session = transport.create_session()
+    adapter = session.get_adapter('https://localhost')
+    assert adapter._pool_maxsize == 32
+    assert session.headers['Connection'] == 'close'
+
+
+@pytest.mark.parametrize("codec_name", ['json', 'orjson'])
+def test_codec(connect_params, codec_name):
+    if codec_name != 'json':
+        pytest.importorskip(codec_name)
+    codec = odoo_connect.get_codec(codec_name)
+    assert codec.loads(codec.dumps({'a': [1, 'b']})) == {'a': [1, 'b']}
+    env = odoo_connect.connect(**connect_params, codec=codec)
+    assert env.codec is codec
+    assert env.user['login'] == connect_params['username']
+
+
+def test_codec_unknown():
+    with pytest.raises(ValueError):
+        odoo_connect.get_codec('unknown')
+
+
+def test_search_read_iter(odoo_cli_orders):
+    records = odoo_cli_orders['sale.order'].search_read_iter([], ['name'])
+    assert not isinstance(records, list)
+    records = list(records)
+    assert len(records) == 50
+    assert records[0] == {'id': 1, 'name': 'S001'}
+
+
+def test_search_read_iter_error():
+    pytest.importorskip('ijson')
+    from odoo_connect.odoo_rpc import _iter_json_rpc_result
+
+    reply = b'{"jsonrpc": "2.0", "id": 1, "error": {"message": "Invalid domain"}}'
+    with pytest.raises(odoo_connect.OdooServerError):
+        list(_iter_json_rpc_result(io.BytesIO(reply)))
+    reply = b'{"jsonrpc": "2.0", "id": 1, "result": [1, {"a": [2, {"b": null}]}, "c"]}'
+    assert list(_iter_json_rpc_result(io.BytesIO(reply))) == [1, {'a': [2, {'b': None}]}, 'c']
+
+
+def test_search_read_dict_iter(odoo_cli_orders):
+    model = odoo_cli_orders['sale.order']
+    records = list(model.search_read_dict_iter([], ['name', 'partner_id.name'], batch_size=7))
+    assert len(records) == 50
+    assert records[1]['partner_id'] == {'id': 3, 'name': 'partner 3'}
+
+
+def test_search_read_iter_pages(odoo_cli_orders, odoo_json_rpc_handler):
+    calls = []
+
+    @odoo_json_rpc_handler.patch_execute_kw('sale.order', 'search_read')
+    def spy(domain, fields=[], load=None, order=None, limit=None):
+        calls.append(domain)  # record and let the fixture answer
+
+    # spy should be called first
+    odoo_json_rpc_handler.call_execute_kw.insert(0, odoo_json_rpc_handler.call_execute_kw.pop())
+    model = odoo_cli_orders['sale.order']
+    records = list(model.search_read_iter([], ['name'], page_size=20))
+    assert [r['id'] for r in records] == list(range(1, 51))
+    assert calls == [[['id', '>', 0]], [['id', '>', 20]], [['id', '>', 40]]]
+    records = list(model.search_read_dict_iter([], ['partner_id.name'], page_size=20, limit=25))
+    assert len(records) == 25
+    with pytest.raises(ValueError):
+        model.search_read_iter([], ['name'], page_size=20, order='name')
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_read_dict_relations(odoo_cli_orders, odoo_json_rpc_handler, max_workers):
+    odoo_cli_orders.max_workers = max_workers
+    fields = ['name', 'partner_id.name', 'company_id.name', 'order_line.product_id.name']
+    order = odoo_cli_orders['sale.order'].read_dict(4, fields)
+    assert order['partner_id'] == {'id': 2, 'name': 'partner 2'}
+    assert order['company_id'] == {'id': 1, 'name': 'company'}
+    assert [line['product_id']['name'] for line in order['order_line']] == [
+        'product 2',
+        'product 3',
+    ]
+    read_models = [model for model, _ids, _fields in odoo_json_rpc_handler.read_calls]
+    assert sorted(read_models) == sorted(
+        ['sale.order', 'res.partner', 'res.company', 'sale.order.line', 'product.product']
+    )
+
+
+def test_read_dict_merge_reads(odoo_cli_orders, odoo_json_rpc_handler):
+    fields = [
+        'partner_id.name',
+        'company_id.partner_id.name',
+        'order_line.order_partner_id.name',
+        'order_line.order_partner_id.country_id.name',
+    ]
+    orders = odoo_cli_orders['sale.order'].read_dict([1, 2], fields)
+    # level 1: partner, company, lines; level 2: partner; level 3: country
+    read_models = [model for model, _ids, _fields in odoo_json_rpc_handler.read_calls]
+    assert sorted(read_models) == sorted(
+        [
+            'sale.order',
+            'res.partner',
+            'res.company',
+            'sale.order.line',
+            'res.partner',
+            'res.country',
+        ]
+    )
+    order = orders[0]
+    assert order['partner_id'] == {'id': 2, 'name': 'partner 2'}
+    assert order['company_id']['partner_id'] == {'id': 4, 'name': 'partner 4'}
+    assert order['order_line'][0]['order_partner_id'] == {
+        'id': 2,
+        'name': 'partner 2',
+        'country_id': {'id': 2, 'name': 'Poland'},
+    }
+
+
+def test_read_dict_chunks(odoo_cli_orders, odoo_json_rpc_handler):
+    model = odoo_cli_orders['sale.order']
+    fields = ['name', 'partner_id.name', 'order_line.product_id.name']
+    expected = model.read_dict(list(range(1, 21)), fields)
+    odoo_json_rpc_handler.read_calls.clear()
+    odoo_cli_orders.read_chunk_size = 7
+    orders = model.read_dict(list(range(1, 21)), fields)
+    assert orders == expected
+    assert all(len(ids) <= 7 for _model, ids, _fields in odoo_json_rpc_handler.read_calls)
+    # orders (3 chunks), partners (1), lines (6), products (1)
+    assert len(odoo_json_rpc_handler.read_calls) == 11
+
+
+def test_metadata_disk_cache(connect_params, odoo_json_rpc_handler, tmp_path):
+    calls = []
+
+    @odoo_json_rpc_handler.patch_execute_kw('ir.module.module', 'search_read')
+    def read_modules(domain, fields=[]):
+        return [{'id': 1, 'name': 'base', 'latest_version': '16.0.1.3'}]
+
+    @odoo_json_rpc_handler.patch_execute_kw('res.partner', 'fields_get')
+    def fields_partner(allfields=[], attributes=[]):
+        calls.append(attributes)
+        return {'id': {'type': 'int', 'string': 'ID'}, 'name': {'type': 'char', 'string': 'Name'}}
+
+    for _i in range(2):
+        cache = odoo_connect.DiskMetadataCache(tmp_path)
+        env = odoo_connect.connect(**connect_params, metadata_cache=cache)
+        assert env['res.partner'].fields()['name']['type'] == 'char'
+    assert len(calls) == 1, "fields_get should be called only once"
+    assert len(list(tmp_path.glob('*.json'))) == 1
+    cache.clear()
+    assert not list(tmp_path.glob('*.json'))
+
+
+def test_metadata_registry(connect_params, odoo_json_rpc_handler):
+    calls = []
+
+    @odoo_json_rpc_handler.patch_execute_kw('res.partner', 'fields_get')
+    def fields_partner(allfields=[], attributes=[]):
+        calls.append(attributes)
+        return {'id': {'type': 'int', 'string': 'ID'}, 'name': {'type': 'char', 'string': 'Name'}}
+
+    env1 = odoo_connect.connect(**connect_params)
+    env2 = odoo_connect.connect(**connect_params)
+    assert env1['res.partner'].fields() is env2['res.partner'].fields()
+    assert len(calls) == 1
+    env2.invalidate_metadata('res.partner')
+    env1['res.partner'].fields()
+    assert len(calls) == 2
+    isolated = odoo_connect.connect(**connect_params)
+    isolated.metadata_registry = odoo_connect.MetadataRegistry()
+    isolated['res.partner'].fields()
+    assert len(calls) == 3
+    # fields_get depends on the groups of the user
+    other = odoo_connect.connect(**{**connect_params, 'username': 'demo', 'password': 'demo'})
+    other['res.partner'].fields()
+    assert len(calls) == 4
+
+
+def test_read_frame(odoo_cli, odoo_json_rpc_handler):
+    pd = pytest.importorskip('pandas')
+    handler = odoo_json_rpc_handler
+    moves = [
+        {
+            'id': i,
+            'name': 'M%d' % i,
+            'date': '2020-01-%02d' % i,
+            'amount': 1.5 * i if i % 2 else False,
+            'state': 'posted' if i % 2 else 'draft',
+            'partner_id': [i, 'partner %d' % i] if i < 3 else False,
+            'line_ids': [10 * i, 10 * i + 1],
+            'checked': bool(i % 2),
+        }
+        for i in range(1, 5)
+    ]
+
+    @handler.patch_execute_kw('account.move', 'fields_get')
+    def fields_get(allfields=[], attributes=[]):
+        types = ['char', 'date', 'monetary', 'selection', 'many2one', 'one2many', 'boolean']
+        return {f: {'type': t} for f, t in zip(list(moves[0])[1:], types)}
+
+    @handler.patch_execute_kw('account.move', 'search_read')
+    def search_read(domain, fields=[], order=None, limit=None):
+        data = [m for m in moves if m['id'] > domain[0][2]][:limit]
+        return [{f: m[f] for f in ['id'] + fields} for m in data]
+
+    fields = ['name', 'date', 'amount', 'state', 'partner_id', 'line_ids', 'checked']
+    frame = odoo_cli['account.move'].read_frame([], fields, page_size=3)
+    assert list(frame.columns) == fields[:5] + ['partner_id.name'] + fields[5:]
+    assert str(frame['date'].dtype).startswith('datetime64')
+    assert frame['date'][0] == pd.Timestamp('2020-01-01')
+    assert frame['amount'].isna().tolist() == [False, True, False, True]
+    assert str(frame['state'].dtype) == 'category'
+    assert str(frame['partner_id'].dtype) == 'Int64'
+    assert frame['partner_id.name'].tolist()[:2] == ['partner 1', 'partner 2']
+    assert frame['partner_id.name'].isna().tolist() == [False, False, True, True]
+    assert frame['line_ids'][0] == [10, 11]
+    assert frame['checked'].dtype == bool
+    with pytest.raises(ValueError):
+        odoo_cli['account.move'].read_frame([], ['partner_id.name'])
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+import odoo_connect
+
+pytest.importorskip('httpx')
+
+
+def test_connect_async_and_read(connect_params):
+    async def run():
+        async with await odoo_connect.connect_async(**connect_params) as env:
+            assert env.is_connected()
+            users = env['res.users']
+            return await asyncio.gather(users.read(1, ['login']), users.read(2, ['login']))
+
+    user1, user2 = asyncio.run(run())
+    assert user1[0]['login'] == connect_params['username']
+    assert user2[0]['login'] == 'other'
+
+
+def test_async_read_dict(connect_params, odoo_json_rpc_handler):
+    handler = odoo_json_rpc_handler
+
+    @handler.patch_execute_kw('sale.order', 'fields_get')
+    def fields_order(allfields=[], attributes=[]):
+        return {
+            'id': {'type': 'int'},
+            'name': {'type': 'char'},
+            'partner_id': {'type': 'many2one', 'relation': 'res.partner'},
+        }
+
+    @handler.patch_execute_kw('sale.order', 'read')
+    def read_order(ids, fields=[], load=None):
+        return [{'id': 1, 'name': 'S1', 'partner_id': 3}]
+
+    @handler.patch_execute_kw('res.partner', 'fields_get')
+    def fields_partner(allfields=[], attributes=[]):
+        return {'id': {'type': 'int'}, 'name': {'type': 'char'}}
+
+    @handler.patch_execute_kw('res.partner', 'read')
+    def read_partner(ids, fields=[], load=None):
+        return [{'id': i, 'name': 'partner %d' % i} for i in ids]
+
+    async def run():
+        async with await odoo_connect.connect_async(**connect_params) as env:
+            return await env['sale.order'].read_dict(1, ['name', 'partner_id.name'])
+
+    order = asyncio.run(run())
+    assert order['name'] == 'S1'
+    assert order['partner_id'] == {'id': 3, 'name': 'partner 3'}
+
+
+def test_connect_async_close_on_error(connect_params, monkeypatch):
+    closed = []
+
+    async def authenticate(self, username, password):
+        raise RuntimeError('authentication failed')
+
+    async def close(self):
+        closed.append(self)
+
+    monkeypatch.setattr(odoo_connect.AsyncOdooClient, 'authenticate', authenticate)
+    monkeypatch.setattr(odoo_connect.AsyncOdooClient, 'close', close)
+    with pytest.raises(RuntimeError):
+        asyncio.run(odoo_connect.connect_async(**connect_params))
+    assert len(closed) == 1
@@ -1,3 +1,9 @@
+import csv
+import datetime
+import gzip
+import hashlib
+import json
+
 import pytest
 
 import odoo_connect.data as odoo_data
@@ -122,3 +128,507 @@ def test_flatten_expand_many():
         )
     )
     assert len(expanded) == 12
+
+
+def test_export_data(odoo_cli_orders):
+    model = odoo_cli_orders['sale.order']
+    fields = ['name', 'partner_id.name']
+    data = odoo_data.export_data(model, [], fields)
+    assert data[0] == fields
+    assert len(data) == 51
+    assert data[1] == ['S001', 'partner 2']
+
+
+def test_export_data_sharded(odoo_cli_orders):
+    model = odoo_cli_orders['sale.order']
+    fields = ['name', 'partner_id.name']
+    expected = odoo_data.export_data(model, [], fields)
+    data = odoo_data.export_data(model, [], fields, shard_size=7, workers=3)
+    assert data == expected
+
+
+def test_parallel_map_nested():
+    import threading
+
+    from odoo_connect.odoo_rpc import parallel_map
+
+    def inner(i):
+        return threading.get_ident()
+
+    def outer(i):
+        return {threading.get_ident()} == set(parallel_map(inner, range(4), 4))
+
+    # nested calls are run by the worker thread itself
+    assert all(parallel_map(outer, range(3), 3))
+
+
+def test_load_data_write(odoo_cli_orders, odoo_json_rpc_handler):
+    writes = []
+
+    @odoo_json_rpc_handler.patch_execute_kw('sale.order', 'write')
+    def write(ids, values):
+        writes.append((ids, values))
+        return True
+
+    @odoo_json_rpc_handler.patch_execute_kw('sale.order', 'create')
+    def create(values):
+        return list(range(100, 100 + len(values)))
+
+    model = odoo_cli_orders['sale.order']
+    data = [{'id': i, 'name': 'done' if i % 2 else 'draft'} for i in range(1, 11)]
+    data.append({'id': False, 'name': 'new'})
+    result = odoo_data.load_data(model, data, method='write', workers=2)
+    assert sorted(writes) == [
+        ([1, 3, 5, 7, 9], {'name': 'done'}),
+        ([2, 4, 6, 8, 10], {'name': 'draft'}),
+    ]
+    assert result['write_count'] == 10 and result['create_count'] == 1
+    assert result['ids'] == list(range(1, 11)) + [100]
+    assert [g['ids'] for g in result['write_groups']] == [[1, 3, 5, 7, 9], [2, 4, 6, 8, 10]]
+    assert all(g['fields'] == ['name'] and g['time'] >= 0 for g in result['write_groups'])
+    # the last row of a record wins
+    writes.clear()
+    data = [{'id': 7, 'name': 'a'}, {'id': 5, 'name': 'b'}, {'id': 5, 'name': 'a'}]
+    odoo_data.load_data(model, data, method='write')
+    assert writes == [([7, 5], {'name': 'a'})]
+
+
+def test_load_data_batches(odoo_cli_orders, odoo_json_rpc_handler):
+    calls = []
+
+    @odoo_json_rpc_handler.patch_execute_kw('sale.order', 'load')
+    def load(fields, data):
+        calls.append(data)
+        ids = [int(row[0][1:]) for row in data]
+        messages = [{'type': 'warning', 'rows': {'from': 0, 'to': 0}}] if len(data) == 3 else []
+        return {'ids': ids, 'messages': messages}
+
+    @odoo_json_rpc_handler.patch_execute_kw('sale.order', 'create')
+    def create(values):
+        calls.append(values)
+        return [int(v['name'][1:]) for v in values]
+
+    model = odoo_cli_orders['sale.order']
+    data = [['name', 'company_id']] + [['S%d' % i, 2 - i % 2] for i in range(1, 12)]
+    result = odoo_data.load_data(model, data, batch_size=4, workers=3)
+    assert sorted(len(c) for c in calls) == [3, 4, 4]
+    assert result['ids'] == list(range(1, 12))
+    assert result['messages'] == [{'type': 'warning', 'rows': {'from': 8, 'to': 8}}]
+
+    calls.clear()
+    result = odoo_data.load_data(
+        model, data, method='create', batch_size=4, group_by='company_id', workers=3
+    )
+    # rows of a company are kept together, results are in the input order
+    assert sorted(len(c) for c in calls) == [5, 6]
+    assert result == list(range(1, 12))
+
+
+def test_load_data_batches_records(odoo_cli_orders, odoo_json_rpc_handler):
+    @odoo_json_rpc_handler.patch_execute_kw('sale.order', 'load')
+    def load(fields, data):
+        # a record spans the rows with the same name, report the last record
+        names = [row[0] for row in data]
+        records = sorted(set(names))
+        first = names.index(records[-1])
+        message = {
+            'type': 'warning',
+            'record': len(records) - 1,
+            'rows': {'from': first, 'to': len(names) - 1},
+        }
+        return {'ids': [int(name[1:]) for name in records], 'messages': [message]}
+
+    model = odoo_cli_orders['sale.order']
+    data = [['name', 'company_id']] + [[name, 1] for name in ['S1', 'S1', 'S2', 'S3']]
+    result = odoo_data.load_data(model, data, batch_size=3, group_by='name')
+    assert result['ids'] == [1, 2, 3]
+    assert result['messages'] == [
+        {'type': 'warning', 'record': 2, 'rows': {'from': 2, 'to': 2}},
+        {'type': 'warning', 'record': 3, 'rows': {'from': 3, 'to': 3}},
+    ]
+
+
+@pytest.mark.parametrize('report_rows', [True, False])
+def test_load_data_resilient(odoo_cli_orders, odoo_json_rpc_handler, report_rows):
+    calls = []
+
+    @odoo_json_rpc_handler.patch_execute_kw('sale.order', 'load')
+    def load(fields, data):
+        calls.append(len(data))
+        bad = [i for i, row in enumerate(data) if row[0].startswith('BAD')]
+        if not bad:
+            return {'ids': [int(row[0][1:]) for row in data], 'messages': []}
+        if report_rows:
+            messages = [{'type': 'error', 'rows': {'from': i, 'to': i}, 'record': i} for i in bad]
+        else:
+            messages = [{'type': 'error'}]
+        return {'ids': False, 'messages': messages}
+
+    model = odoo_cli_orders['sale.order']
+    data = [['name']] + [['BAD' if i in (3, 7) else 'S%d' % i] for i in range(10)]
+    result = odoo_data.load_data(model, data, resilient=True)
+    assert result['ids'] == [0, 1, 2, 4, 5, 6, 8, 9]
+    assert [e['row'] for e in result['errors']] == [3, 7]
+    if report_rows:
+        assert calls == [10, 8]
+        assert result['errors'][1]['messages'] == [
+            {'type': 'error', 'rows': {'from': 7, 'to': 7}, 'record': 7}
+        ]
+    else:
+        assert len(calls) < 2 * len(data)
+
+    calls.clear()
+    result = odoo_data.load_data(model, data, resilient=True, batch_size=4)
+    assert result['ids'] == [0, 1, 2, 4, 5, 6, 8, 9]
+    assert [e['row'] for e in result['errors']] == [3, 7]
+    if report_rows:
+        # the rows and records of the batches are mapped to the input rows
+        assert result['errors'][1]['messages'] == [
+            {'type': 'error', 'rows': {'from': 7, 'to': 7}, 'record': 7}
+        ]
+
+    # all the rows are reported, no retry
+    calls.clear()
+    result = odoo_data.load_data(model, [['name']] + [['BAD']] * 8, resilient=True)
+    assert len(result['errors']) == 8 and not result['ids']
+    assert len(calls) == (1 if report_rows else 15)
+    with pytest.raises(ValueError):
+        odoo_data.load_data(model, data, method='create', resilient=True)
+
+
+def test_export_to_file(odoo_cli_orders, tmp_path):
+    model = odoo_cli_orders['sale.order']
+    fields = ['name', 'partner_id.name', 'order_line']
+    expected = odoo_data.export_data(model, [], fields)
+
+    path = tmp_path / 'orders.csv'
+    assert odoo_data.export_to_file(model, [], fields, path, page_size=7) == 50
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == expected[0]
+    assert rows[1] == ['S001', 'partner 2', '[11, 12]']
+    assert len(rows) == 51
+
+    path = tmp_path / 'orders.jsonl.gz'
+    assert odoo_data.export_to_file(model, [], fields, path, 'jsonl', expand_many=True) == 100
+    with gzip.open(path, 'rt') as f:
+        lines = [json.loads(line) for line in f]
+    assert lines[0] == {'name': 'S001', 'partner_id.name': 'partner 2', 'order_line': 11}
+
+    with pytest.raises(ValueError):
+        odoo_data.export_to_file(model, [], fields, path, 'xml')
+
+
+def test_export_arrow(odoo_cli_orders, odoo_orders_data, tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+    line_fields, lines = odoo_orders_data['sale.order.line']
+    line_fields['date'] = {'type': 'date'}
+    for line in lines.values():
+        line['date'] = '2020-01-%02d' % (line['id'] % 28 + 1)
+    lines[12]['date'] = False
+    lines[12]['product_id'] = False
+    model = odoo_cli_orders['sale.order']
+
+    fields = ['id', 'name', 'partner_id', 'order_line']
+    batches = list(odoo_data.export_arrow_batches(model, [], fields, page_size=20))
+    assert [b.num_rows for b in batches] == [20, 20, 10]
+    assert batches[0].schema.types == [pa.int64(), pa.string(), pa.int64(), pa.list_(pa.int64())]
+    assert batches[0].to_pylist()[0] == {
+        'id': 1,
+        'name': 'S001',
+        'partner_id': 2,
+        'order_line': [11, 12],
+    }
+
+    fields = ['name', 'partner_id.country_id.name', 'order_line.product_id']
+    path = tmp_path / 'orders.parquet'
+    assert odoo_data.export_to_parquet(model, [], fields, path, page_size=20) == 50
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.schema.field('order_line.product_id').type == pa.list_(pa.int64())
+    assert table.to_pylist()[0] == {
+        'name': 'S001',
+        'partner_id.country_id.name': 'Poland',
+        'order_line.product_id': [2, None],
+    }
+
+    # values of an x2many are typed as lists of the field type
+    fields = ['name', 'order_line.date', 'order_line.product_id']
+    batch = next(odoo_data.export_arrow_batches(model, [], fields))
+    assert batch.schema.types[1:] == [pa.list_(pa.date32()), pa.list_(pa.int64())]
+    assert batch.to_pylist()[:2] == [
+        {
+            'name': 'S001',
+            'order_line.date': [datetime.date(2020, 1, 12), None],
+            'order_line.product_id': [2, None],
+        },
+        {
+            'name': 'S002',
+            'order_line.date': [datetime.date(2020, 1, 22), datetime.date(2020, 1, 23)],
+            'order_line.product_id': [2, 3],
+        },
+    ]
+
+
+def test_arrow_array():
+    pa = pytest.importorskip('pyarrow')
+    dates = odoo_data._arrow_array(['2020-01-31', False], pa.date32())
+    assert dates.to_pylist() == [datetime.date(2020, 1, 31), None]
+    times = odoo_data._arrow_array(['2020-01-31 10:11:12'], pa.timestamp('s'))
+    assert times.to_pylist() == [datetime.datetime(2020, 1, 31, 10, 11, 12)]
+    states = odoo_data._arrow_array(
+        ['draft', 'done', 'draft'], pa.dictionary(pa.int32(), pa.string())
+    )
+    assert states.dictionary.to_pylist() == ['draft', 'done']
+    assert odoo_data._arrow_array([False, True], pa.bool_()).to_pylist() == [False, True]
+
+    # values in lists are converted with the type of the elements
+    dates = odoo_data._arrow_array([['2020-01-31', False], False, []], pa.list_(pa.date32()))
+    assert dates.to_pylist() == [[datetime.date(2020, 1, 31), None], None, []]
+    times = odoo_data._arrow_array([['2020-01-31 10:11:12']], pa.list_(pa.timestamp('s')))
+    assert times.to_pylist() == [[datetime.datetime(2020, 1, 31, 10, 11, 12)]]
+    amounts = odoo_data._arrow_array([[1.5, False]], pa.list_(pa.float64()))
+    assert amounts.to_pylist() == [[1.5, None]]
+
+
+def _match_domain(record, domain):
+    """Evaluate a simple domain on a record (prefix notation)"""
+    operators = {
+        '=': lambda a, b: a == b,
+        '>': lambda a, b: a > b,
+        '>=': lambda a, b: a >= b,
+        '<=': lambda a, b: a <= b,
+        'in': lambda a, b: a in b,
+    }
+
+    def evaluate(items):
+        item = items.pop(0)
+        if item == '|':
+            left, right = evaluate(items), evaluate(items)
+            return left or right
+        if item == '&':
+            left, right = evaluate(items), evaluate(items)
+            return left and right
+        field, op, value = item
+        return operators[op](record[field], value)
+
+    items = list(domain)
+    result = True
+    while items:
+        result = evaluate(items) and result
+    return result
+
+
+@pytest.fixture(scope='function')
+def odoo_cli_templates(odoo_cli, odoo_json_rpc_handler):
+    """Client with product.template records having a write_date"""
+    handler = odoo_json_rpc_handler
+    handler.search_read_calls = 0
+    handler.templates = templates = {
+        i: {'id': i, 'name': 'T%d' % i, 'write_date': '2020-01-%02d 00:00:00' % (i % 3 + 1)}
+        for i in range(1, 11)
+    }
+
+    def search(domain, order=None, limit=None):
+        data = [t for t in templates.values() if _match_domain(t, domain)]
+        if order:
+            assert order == 'id'
+            data.sort(key=lambda t: t['id'])
+        return data[:limit] if limit else data
+
+    @handler.patch_execute_kw('product.template', 'fields_get')
+    def fields_get(allfields=[], attributes=[]):
+        return {'id': {'type': 'integer'}, 'name': {'type': 'char'}, 'write_date': {}}
+
+    @handler.patch_execute_kw('product.template', 'search_read')
+    def search_read(domain, fields=[], load=None, order=None, limit=None):
+        handler.search_read_calls += 1
+        # the write_date is stored with microseconds, but returned truncated
+        return [
+            {f: t[f][:19] if f == 'write_date' else t[f] for f in ['id'] + fields}
+            for t in search(domain, order=order, limit=limit)
+        ]
+
+    @handler.patch_execute_kw('product.template', 'search')
+    def search_ids(domain, order=None, limit=None):
+        return [t['id'] for t in search(domain, order=order, limit=limit)]
+
+    @handler.patch_execute_kw('product.template', 'search_count')
+    def search_count(domain):
+        return len(search(domain))
+
+    return odoo_cli
+
+
+def test_export_changes(odoo_cli_templates, odoo_json_rpc_handler, tmp_path):
+    templates = odoo_json_rpc_handler.templates
+    model = odoo_cli_templates['product.template']
+    path = tmp_path / 'state.json'
+    result = odoo_data.export_changes(model, [], ['id', 'name'], path, page_size=4)
+    assert result['data'][0] == ['id', 'name']
+    assert sorted(row[0] for row in result['data'][1:]) == list(range(1, 11))
+    assert result['deleted_ids'] == []
+    assert result['write_date'] == '2020-01-03 00:00:00'
+
+    templates[2]['name'] = 'changed'
+    templates[2]['write_date'] = '2020-01-05 00:00:00'
+    templates[11] = {'id': 11, 'name': 'T11', 'write_date': '2020-01-04 00:00:00'}
+    del templates[5]
+    result = odoo_data.export_changes(
+        model, [], ['id', 'name'], path, with_header=False, chunk_size=3
+    )
+    assert result['data'] == [[2, 'changed'], [11, 'T11']]
+    assert result['deleted_ids'] == [5]
+    state = odoo_data.ExportState(path)
+    assert len(state._data) == 1
+    state = next(iter(state._data.values()))
+    assert state['write_date'] == '2020-01-05 00:00:00'
+    assert 5 not in state['ids'] and 11 in state['ids']
+
+    result = odoo_data.export_changes(model, [], ['id', 'name'], path)
+    assert result['data'] == [['id', 'name']] and result['deleted_ids'] == []
+
+    # another export of the model has its own state
+    result = odoo_data.export_changes(model, [], ['name'], path)
+    assert len(result['data']) == 11
+
+
+def test_export_changes_same_second(odoo_cli_templates, odoo_json_rpc_handler, tmp_path):
+    handler = odoo_json_rpc_handler
+    templates = handler.templates
+    for t in templates.values():
+        t['write_date'] = '2020-01-01 00:00:00.%06d' % t['id']
+    model = odoo_cli_templates['product.template']
+    path = tmp_path / 'state.json'
+    fields = ['id', 'name']
+    result = odoo_data.export_changes(model, [], fields, path, page_size=4)
+    assert [row[0] for row in result['data'][1:]] == list(range(1, 11))
+    assert handler.search_read_calls == 3
+
+    # a transaction committed late, with an earlier date
+    templates[12] = {'id': 12, 'name': 'T12', 'write_date': '2019-12-31 23:59:30'}
+    result = odoo_data.export_changes(model, [], fields, path, page_size=4)
+    assert result['data'] == [fields, [12, 'T12']]
+
+    # a record written again in the same second
+    templates[4]['name'] = 'rewritten'
+    templates[4]['write_date'] = '2020-01-01 00:00:00.900000'
+    result = odoo_data.export_changes(model, [], fields, path, page_size=4)
+    assert result['data'] == [fields, [4, 'rewritten']]
+
+    templates[3]['name'] = 'later'
+    templates[3]['write_date'] = '2020-01-01 00:00:02'
+    result = odoo_data.export_changes(model, [], fields, path, page_size=4)
+    assert result['data'] == [fields, [3, 'later']]
+    result = odoo_data.export_changes(model, [], fields, path, page_size=4)
+    assert result['data'] == [fields]
+
+
+@pytest.mark.parametrize('file_name', ['orders.csv', 'orders.jsonl.gz'])
+def test_export_resumable(odoo_cli_orders, odoo_json_rpc_handler, tmp_path, file_name):
+    model = odoo_cli_orders['sale.order']
+    fields = ['name', 'partner_id.name']
+    format = 'jsonl' if 'jsonl' in file_name else 'csv'
+    path = tmp_path / file_name
+    pages = []
+
+    def fail_third_page(model, function, a, kw):
+        if model == 'sale.order' and function == 'search_read' and a[0]:
+            pages.append(a[0][0][2])
+            if len(pages) == 3:
+                raise RuntimeError('connection reset')
+
+    odoo_json_rpc_handler.call_execute_kw.insert(0, fail_third_page)
+    with pytest.raises(Exception):
+        odoo_data.export_resumable(model, [], fields, path, format, page_size=20)
+    state_path = tmp_path / (file_name + '.state.json')
+    assert odoo_data.ExportState(state_path).get(str(path))['id'] == 40
+    # add a partial page, which is removed when resuming
+    with open(path, 'ab') as f:
+        f.write(b'partial')
+    assert odoo_data.export_resumable(model, [], fields, path, format, page_size=20) == 50
+    assert pages == [0, 20, 40, 40]
+    assert not state_path.exists()
+
+    if format == 'csv':
+        expected = odoo_data.export_data(model, [], fields)
+        with open(path, newline='') as f:
+            assert list(csv.reader(f)) == expected
+    else:
+        with gzip.open(path, 'rt') as f:
+            lines = [json.loads(line) for line in f]
+        assert len(lines) == 50
+        assert lines[49] == {'name': 'S050', 'partner_id.name': 'partner 3'}
+    with pytest.raises(ValueError):
+        odoo_data.ExportState(state_path).set(str(path), {'parameters': {}})
+        odoo_data.export_resumable(model, [], ['name'], path, format)
+
+
+def test_export_resumable_restart(odoo_cli_orders, odoo_json_rpc_handler, tmp_path):
+    model = odoo_cli_orders['sale.order']
+    path = tmp_path / 'orders.csv'
+    state_path = tmp_path / 'state.json'
+    odoo_data.export_resumable(model, [], ['name'], path)
+    expected = path.read_bytes()
+
+    def fail_second_page(model, function, a, kw):
+        if function == 'search_read' and a[0] and a[0][0][2] == 20:
+            raise RuntimeError('connection reset')
+
+    odoo_json_rpc_handler.call_execute_kw.insert(0, fail_second_page)
+    with pytest.raises(Exception):
+        odoo_data.export_resumable(model, [], ['name'], path, page_size=20, state=state_path)
+    odoo_json_rpc_handler.call_execute_kw.remove(fail_second_page)
+    # other options than the checkpoint
+    with pytest.raises(ValueError):
+        odoo_data.export_resumable(model, [], ['name'], path, with_header=False, state=state_path)
+    # the file was removed, the export starts again
+    path.unlink()
+    odoo_data.export_resumable(model, [], ['name'], path, page_size=20, state=state_path)
+    assert path.read_bytes() == expected
+
+
+def test_download_attachments(odoo_cli, odoo_json_rpc_handler, httpserver, tmp_path):
+    handler = odoo_json_rpc_handler
+    contents = {1: b'%PDF-1.4 test' * 1000, 2: b'other', 3: b''}
+    attachments = [
+        {'id': 1, 'name': 'report.pdf', 'type': 'binary'},
+        {'id': 2, 'name': '../secret.txt', 'type': 'binary'},
+        {'id': 3, 'name': 'link', 'type': 'url'},
+    ]
+    for a in attachments:
+        a['checksum'] = hashlib.sha1(contents[a['id']]).hexdigest()
+        httpserver.expect_request('/web/content/%d' % a['id']).respond_with_data(contents[a['id']])
+
+    @handler.patch_execute_kw('ir.attachment', 'read')
+    def read_attachment(ids, fields=[], load=None):
+        return [a for a in attachments if a['id'] in ids]
+
+    result = odoo_data.download_attachments(odoo_cli, [1, 2, 3], tmp_path / 'files', workers=2)
+    assert result == {
+        1: tmp_path / 'files' / '1_report.pdf',
+        2: tmp_path / 'files' / '2_secret.txt',
+    }
+    for id, path in result.items():
+        assert path.read_bytes() == contents[id]
+    assert sorted(p.name for p in (tmp_path / 'files').iterdir()) == [
+        '1_report.pdf',
+        '2_secret.txt',
+    ]
+
+    # resume: files with a matching checksum are not downloaded again
+    result[2].write_bytes(b'partial')
+    downloaded = len(httpserver.log)
+    odoo_data.download_attachments(odoo_cli, [1, 2], tmp_path / 'files')
+    urls = [request.path for request, _response in httpserver.log[downloaded:]]
+    assert urls.count('/web/content/1') == 0
+    assert urls.count('/web/content/2') == 1
+    assert result[2].read_bytes() == contents[2]
+
+    # corrupted download
+    attachments[0]['checksum'] = 'invalid'
+    with pytest.raises(ValueError):
+        odoo_data.download_attachments(odoo_cli, [1], tmp_path / 'files')
+    assert not result[1].exists()
@@ -1,6 +1,13 @@
 import pytest
 
-from odoo_connect.explore import Instance, explore
+from odoo_connect.explore import (
+    GLOBAL_CACHE,
+    ColumnarModelCache,
+    Instance,
+    RecordCache,
+    batch,
+    explore,
+)
 
 
 @pytest.fixture(scope='function')
@@ -124,3 +131,206 @@ def test_ex_write_format(odoo_cli_partner: Instance):
     assert inst.name == 'test'
     inst.write({'name': ''}, format=True)
     assert inst.name is False
+
+
+def test_ex_cache_lru(odoo_cli_partner: Instance):
+    cache = RecordCache(max_records_per_model=1)
+    token = GLOBAL_CACHE.set(cache)
+    try:
+        odoo_cli_partner.browse(1, 2).cache()
+        assert cache.stats()['records'] == 1
+        assert cache.evictions == 1
+        # record 2 is still in the cache, 1 is read again
+        assert odoo_cli_partner.browse(2).name == 'demo'
+        assert cache.hits == 1
+        assert odoo_cli_partner.browse(1).name == 'test'
+        assert cache.evictions == 2
+    finally:
+        GLOBAL_CACHE.reset(token)
+
+
+def test_ex_cache_ttl_memory(odoo_cli_partner: Instance):
+    cache = RecordCache(ttl=1)
+    model_cache = cache.model(odoo_cli_partner._model)
+    model_cache.set(1, {'id': 1, 'name': 'test'})
+    assert 1 in model_cache
+    model_cache._entries[1].time -= 2
+    assert model_cache.get(1) is None
+    assert cache.evictions == 1 and cache.memory == 0
+    model_cache.set(1, {'id': 1, 'name': 'test'})
+    model_cache._entries[1].time -= 2
+    assert model_cache.update_record(1, {'email': 'x'}) == {'email': 'x'}
+
+    cache = RecordCache(max_memory=1)
+    model_cache = cache.model(odoo_cli_partner._model)
+    model_cache.update({1: {'id': 1}, 2: {'id': 2}})
+    assert list(model_cache.keys()) == [2]
+    cache.clear()
+    assert cache.stats() == {'records': 0, 'memory': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def test_ex_cache_columnar(odoo_cli_partner: Instance):
+    cache = RecordCache(columnar=True)
+    token = GLOBAL_CACHE.set(cache)
+    try:
+        inst = odoo_cli_partner.browse(1, 2)
+        assert inst.mapped('name') == ['test', 'demo']
+        assert inst.read()[1] == {'id': 2, 'name': 'demo', 'display_name': 'demo'}
+        model_cache = cache.model(odoo_cli_partner._model)
+        assert isinstance(model_cache, ColumnarModelCache)
+        assert set(model_cache._columns) == {'id', 'name', 'display_name'}
+        model_cache.pop(1)
+        model_cache.set(3, {'id': 3})
+        assert model_cache._row_count == 2
+        assert model_cache[3] == {'id': 3}
+        assert model_cache.update_record(2, {'name': 'x'})['name'] == 'x'
+    finally:
+        GLOBAL_CACHE.reset(token)
+
+
+def test_ex_prefetch(odoo_cli_orders, odoo_json_rpc_handler):
+    handler = odoo_json_rpc_handler
+    orders = explore(odoo_cli_orders['sale.order']).browse(1, 2, 3)
+    lines = orders.order_line
+    assert len(lines) == 6
+    names = [line.product_id.name for line in lines]
+    assert len(names) == 6
+    # one read per model, not per record
+    assert [m for m, _ids, _fields in handler.read_calls] == [
+        'sale.order',
+        'sale.order.line',
+        'product.product',
+    ]
+    assert sorted(handler.read_calls[1][1]) == [11, 12, 21, 22, 31, 32]
+    filtered = lines.filtered(lambda line: line.order_id.name == 'S001')
+    assert filtered.ids == [11, 12] and filtered._prefetch_ids == lines.ids
+    # order_id is read for all the lines, then the orders
+    assert [m for m, _ids, _fields in handler.read_calls[3:]] == ['sale.order.line', 'sale.order']
+    assert lines[0].with_prefetch()._prefetch_ids == lines.ids[:1]
+
+
+def test_ex_prefetch_window(odoo_cli_orders, odoo_json_rpc_handler, monkeypatch):
+    import odoo_connect.explore as odoo_explore
+
+    handler = odoo_json_rpc_handler
+    monkeypatch.setattr(odoo_explore, 'PREFETCH_MAX', 10)
+    lines = explore(odoo_cli_orders['sale.order.line']).browse(
+        *(10 * i + j for i in range(1, 51) for j in (1, 2))
+    )
+    names = [lines[k].order_id.name for k in range(len(lines))]
+    assert names[-1] == 'S050'
+    # the group is read by windows of 10 records following the iteration
+    models = [m for m, _ids, _fields in handler.read_calls]
+    assert models.count('sale.order.line') == 10
+    assert models.count('sale.order') == 10
+    # when the records are cached, the related group is not computed
+    order = lines[5].order_id
+    assert order.name == 'S003'
+    assert order._Instance__prefetch_ids._compute is not None
+    assert len(handler.read_calls) == 20
+
+
+def test_ex_lazy(odoo_cli_orders, odoo_json_rpc_handler):
+    handler = odoo_json_rpc_handler
+    cache = RecordCache(lazy=True, hot_fields={'sale.order.line': ['name']})
+    token = GLOBAL_CACHE.set(cache)
+    try:
+        lines = explore(odoo_cli_orders['sale.order.line'])
+        assert lines.browse(11, 12).mapped('product_id.name')
+        assert sorted(handler.read_calls[0][2]) == ['id', 'name', 'product_id']
+        assert lines.browse(21).order_id and lines.browse(31).order_id
+        # order_id was read twice, it's now hot
+        assert lines.browse(41).product_id
+        assert sorted(handler.read_calls[-1][2]) == ['id', 'name', 'order_id', 'product_id']
+        assert lines.browse(41).order_id.ids == [4]
+        assert len(handler.read_calls) == 5
+        # search reads only the hot fields
+        searches = []
+
+        def spy(model, function, a, kw):
+            if function == 'search_read':
+                searches.append(kw.get('fields') or a[1])
+
+        handler.call_execute_kw.insert(0, spy)
+        found = lines.search([('id', '>', 500)])
+        assert found.ids == [501, 502] and found.order_id.ids == [50]
+        assert sorted(searches[0]) == ['id', 'name', 'order_id', 'product_id']
+    finally:
+        GLOBAL_CACHE.reset(token)
+
+
+def test_ex_batch(odoo_cli_partner: Instance, odoo_json_rpc_handler):
+    writes = []
+
+    def spy(model, function, a, kw):
+        if function == 'write':
+            writes.append(a)
+
+    odoo_json_rpc_handler.call_execute_kw.insert(0, spy)
+    partners = odoo_cli_partner.browse(1, 2)
+    with batch() as pending:
+        for i in range(len(partners)):
+            partner = partners[i]
+            partner.name = 'x'
+            partner.write({'name': 'batch', 'display_name': 'b'})
+        partners[0].write({'display_name': 'first'})
+        assert len(pending) == 2 and not writes
+    assert sorted(writes) == [
+        [[1], {'name': 'batch', 'display_name': 'first'}],
+        [[2], {'name': 'batch', 'display_name': 'b'}],
+    ]
+
+    writes.clear()
+    with partners.batch():
+        partners.name = 'same'
+        assert not writes
+        # reading flushes the writes
+        assert partners.mapped('name') == ['same', 'same']
+        assert writes == [[[1, 2], {'name': 'same'}]]
+    assert len(writes) == 1
+
+    with pytest.raises(RuntimeError):
+        with batch():
+            partners.name = 'discarded'
+            raise RuntimeError('discard')
+    assert len(writes) == 1
+
+
+def test_ex_batch_order(odoo_cli_orders, odoo_json_rpc_handler):
+    writes = []
+    for model in ('sale.order', 'sale.order.line', 'res.partner'):
+
+        @odoo_json_rpc_handler.patch_execute_kw(model, 'write')
+        def write(ids, values, model=model):
+            if values.get('name') == 'fail':
+                raise RuntimeError('write failed')
+            writes.append((model, values['name']))
+            return True
+
+    orders = explore(odoo_cli_orders['sale.order'])
+    lines = explore(odoo_cli_orders['sale.order.line'])
+    with batch():
+        orders.browse(1).name = 'parent'
+        lines.browse(11).name = 'child'
+        orders.browse(1).name = 'parent again'
+        explore(odoo_cli_orders['res.partner']).browse(1).name = 'other'
+    assert writes == [
+        ('sale.order', 'parent'),
+        ('sale.order.line', 'child'),
+        ('sale.order', 'parent again'),
+        ('res.partner', 'other'),
+    ]
+
+    # a failed write is kept with the following ones
+    writes.clear()
+    with pytest.raises(Exception):
+        with batch() as pending:
+            orders.browse(2).name = 'ok'
+            orders.browse(3).name = 'fail'
+            lines.browse(21).name = 'child'
+    assert writes == [('sale.order', 'ok')]
+    assert len(pending) == 2
+    pending.pending[0][1][3]['name'] = 'fixed'
+    pending.flush()
+    assert writes[1:] == [('sale.order', 'fixed'), ('sale.order.line', 'child')]
+    assert not pending